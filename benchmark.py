@@ -0,0 +1,89 @@
+"""Compare Decoder.load execution modes on the same capture.
+
+Run with:
+
+    python benchmark.py Test_Data/datos_asterix_combinado.ast --max-messages 50000
+
+Each mode decodes the same file and the wall-clock time, throughput and
+message count are reported side by side.
+"""
+
+import argparse
+import gc
+from time import perf_counter
+
+import numpy as np
+from rich import print
+from rich.table import Table
+
+from decoder.decoder import DECODE_MODES, Decoder, default_workers
+from decoder.geoutils import CoordinatesWGS84
+
+
+def parse_args():
+    """Create CLI parser for the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark Decoder.load modes")
+    parser.add_argument(
+        "file",
+        nargs="?",
+        default="Test_Data/datos_asterix_combinado.ast",
+        help="ASTERIX capture to decode",
+    )
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=DECODE_MODES,
+        default=list(DECODE_MODES),
+        help="Modes to compare",
+    )
+    parser.add_argument(
+        "--max-messages",
+        type=int,
+        default=None,
+        help="Maximum number of messages to decode",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=default_workers(),
+        help="Pool size for the process and thread modes",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Runs per mode (best is kept)"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    radar_lat = (41 + 18 / 60.0 + 2.5184 / 3600.0) * np.pi / 180
+    radar_lon = (2 + 6 / 60.0 + 7.4095 / 3600.0) * np.pi / 180
+    radar_alt = 27.25
+    coords_radar = CoordinatesWGS84(radar_lat, radar_lon, radar_alt)
+
+    table = Table(title=f"Decoder.load on {args.file} ({args.workers} workers)")
+    table.add_column("Mode")
+    table.add_column("Messages", justify="right")
+    table.add_column("Best time (s)", justify="right")
+    table.add_column("Msg/s", justify="right")
+
+    for mode in args.modes:
+        best = float("inf")
+        count = 0
+        for _ in range(args.repeat):
+            gc.collect()
+            decoder = Decoder()
+            start = perf_counter()
+            decoded = decoder.load(
+                args.file,
+                max_messages=args.max_messages,
+                radar_coords=coords_radar,
+                mode=mode,
+                workers=args.workers,
+            )
+            best = min(best, perf_counter() - start)
+            count = len(decoded)
+            del decoded
+        table.add_row(mode, str(count), f"{best:.2f}", f"{count / best:,.0f}")
+
+    print(table)
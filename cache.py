@@ -0,0 +1,232 @@
+"""On-disk cache of decoded dashboard DataFrames.
+
+``load_messages`` output is stored as Parquet under a cache directory, keyed
+by the capture's path, size and mtime plus every option that changes the
+result (backend, radar position, message cap) and a fingerprint of the
+decoders themselves. Reopening a capture then costs a Parquet read instead
+of a full decode.
+
+The directory defaults to ``~/.cache/asterix_decoder`` and can be moved with
+``ASTERIX_CACHE_DIR``; ``ASTERIX_CACHE_MAX_BYTES`` sets the size budget.
+Entries are evicted least-recently-used first once the budget is exceeded.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from importlib.util import find_spec
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Bump when the cached DataFrame layout changes.
+CACHE_FORMAT = 1
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+try:
+    DECODER_VERSION = version("asterix-decoder")
+except PackageNotFoundError:
+    DECODER_VERSION = "dev"
+
+
+@lru_cache(maxsize=None)
+def decoder_fingerprint():
+    """Hash of the Python decoder sources and the built decoderrs module.
+
+    The package version does not change when a decoder is fixed; the
+    fingerprint does, so tables cached by the old decoder are not reused.
+    """
+    files = []
+    spec = find_spec("decoder")
+    for location in (spec.submodule_search_locations or []) if spec else []:
+        files += sorted(Path(location).rglob("*.py"))
+    spec = find_spec("decoderrs")
+    if spec is not None and spec.origin and os.path.isfile(spec.origin):
+        files.append(Path(spec.origin))
+    digest = hashlib.sha256(DECODER_VERSION.encode())
+    for path in files:
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def default_cache_dir():
+    """Cache directory from ``ASTERIX_CACHE_DIR`` or the user cache."""
+    directory = os.environ.get("ASTERIX_CACHE_DIR")
+    if directory:
+        return Path(directory)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "asterix_decoder"
+
+
+class DecodeCache:
+    """LRU store of decoded DataFrames as Parquet files."""
+
+    def __init__(self, directory=None, max_bytes=None):
+        """Create the cache; nothing touches the disk until it is used."""
+        self.directory = Path(directory) if directory else default_cache_dir()
+        if max_bytes is None:
+            max_bytes = int(
+                os.environ.get("ASTERIX_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+            )
+        self.max_bytes = max_bytes
+
+    def key(self, data_file, **options):
+        """Hash the capture identity and decode options into a cache key."""
+        stat = os.stat(data_file)
+        payload = {
+            "path": os.path.abspath(data_file),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "format": CACHE_FORMAT,
+            "decoder": decoder_fingerprint(),
+            "options": options,
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=repr).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _path(self, key):
+        return self.directory / f"{key}.parquet"
+
+    def get(self, key):
+        """Return the cached DataFrame for ``key`` or ``None``."""
+        path = self._path(key)
+        try:
+            df = pd.read_parquet(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Discarding unreadable cache entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+        # The mtime doubles as the LRU timestamp.
+        os.utime(path)
+        return df
+
+    def put(self, key, df):
+        """Store ``df`` under ``key`` and evict old entries if over budget."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Could not write cache entry {path.name}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+        self.evict()
+
+    def writer(self, key):
+        """:class:`CacheWriter` storing an entry under ``key`` batch by batch."""
+        return CacheWriter(self, key)
+
+    def evict(self):
+        """Delete least-recently-used entries until under ``max_bytes``."""
+        entries = []
+        for path in self.directory.glob("*.parquet"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self):
+        """Remove every cache entry."""
+        for path in self.directory.glob("*.parquet"):
+            path.unlink(missing_ok=True)
+
+
+class CacheWriter:
+    """Store a cache entry from batches of rows without joining them.
+
+    Each batch is written to its own Parquet file; :meth:`commit` streams
+    them into the entry under one schema, promoting columns that are empty
+    in some batches or integer in some and float in others. The entry only
+    exists once committed; :meth:`discard` drops the batches written so far.
+    """
+
+    def __init__(self, cache, key):
+        self.cache = cache
+        self.key = key
+        self._directory = cache.directory / f"{key}.{os.getpid()}.parts"
+        self._parts = []
+        self._categorical = set()
+        self._failed = False
+
+    def write(self, df):
+        """Add the rows of ``df``."""
+        if self._failed:
+            return
+        # Categories differ between batches (and an empty categorical has
+        # no value type), so batches store plain values; the columns are
+        # dictionary-encoded again on commit.
+        categorical = [
+            col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)
+        ]
+        self._categorical.update(categorical)
+        if categorical:
+            df = df.astype({col: object for col in categorical})
+        self._directory.mkdir(parents=True, exist_ok=True)
+        path = self._directory / f"{len(self._parts):06d}.parquet"
+        try:
+            df.to_parquet(path, index=False)
+        except Exception as e:
+            print(f"Could not write cache entry {self.key}: {e}")
+            self._failed = True
+            self.discard()
+            return
+        self._parts.append(path)
+
+    def commit(self):
+        """Turn the batches written so far into the cache entry."""
+        if self._failed or not self._parts:
+            self.discard()
+            return
+        path = self.cache._path(self.key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            schema = pa.unify_schemas(
+                [pq.read_schema(part) for part in self._parts],
+                promote_options="permissive",
+            ).remove_metadata()
+            for i, field in enumerate(schema):
+                if field.name in self._categorical and field.type in (
+                    pa.null(),
+                    pa.string(),
+                ):
+                    dictionary = pa.dictionary(pa.int32(), pa.string())
+                    schema = schema.set(i, field.with_type(dictionary))
+            with pq.ParquetWriter(tmp_path, schema) as writer:
+                for part in self._parts:
+                    table = pq.read_table(part)
+                    for field in schema:
+                        if field.name not in table.column_names:
+                            column = pa.nulls(table.num_rows, field.type)
+                            table = table.append_column(field.name, column)
+                    writer.write_table(table.select(schema.names).cast(schema))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Could not write cache entry {path.name}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+        finally:
+            self.discard()
+        self.cache.evict()
+
+    def discard(self):
+        """Delete the batches written so far."""
+        shutil.rmtree(self._directory, ignore_errors=True)
+        self._parts = []
@@ -11,10 +11,13 @@ The dashboard loads ASTERIX data using `decoder.Decoder().load()` (see
 `decoder/__main__.py` for example usage).
 """
 
+import os
+import queue
 import time
 import threading
 import traceback
 import colorsys
+from concurrent.futures import ThreadPoolExecutor
 
 import dearpygui.dearpygui as dpg
 import numpy as np
@@ -23,8 +26,29 @@ from tqdm import tqdm
 import gc
 
 import decoderrs
+from cache import DecodeCache
+from decoder.compression import detect_compression
 from decoder.decoder import Decoder
+from decoder.export import TABLE_EXTENSIONS, read_table, write_table
 from decoder.geoutils import CoordinatesWGS84
+from filters import FilterEngine
+from frames import (
+    FRAME_CHUNK,
+    FrameIndex,
+    FrameProvider,
+    MarkerIndex,
+    TrackIndex,
+    concat_messages,
+    ground_status,
+)
+from render import (
+    DETAIL_LIMIT,
+    LOD_CATEGORIES,
+    SeriesPool,
+    select_detail,
+    trail_polyline,
+    view_tolerance,
+)
 from mapdata import *
 
 DEFAULT_DATA = "Test_Data/datos_asterix_combinado.ast"
@@ -68,258 +92,293 @@ ALL_EXPECTED_COLUMNS = [
     "Is_Static",
 ]
 
+# Rust-path fallbacks for fields a message does not carry: text columns
+# default to "", flag columns to False and everything else to 0.
+RUST_TEXT_COLUMNS = [
+    "Time String",
+    "Mode-3/A Code",
+    "Aircraft Address",
+    "Target Identification",
+    "STAT",
+]
+RUST_FLAG_COLUMNS = ["GBS", "Is_Pure", "Is_Static"]
 
-def generate_per_frame_df(df: pd.DataFrame):
-    """Interpolate sparse aircraft telemetry into per-frame samples using a vectorized approach.
-
-    Args:
-        df: Raw decoded ASTERIX records containing positional fields.
-
-    Returns:
-        DataFrame where each aircraft/category pair has a contiguous
-        frame timeline with interpolated latitude, longitude, altitude,
-        and motion attributes. The frame column is used later for
-        playback and filtering.
-    """
-
-    # Part 1: Initial time-based interpolation for Altitude (m)
-    # This remains as it was, as it operates on the original time, not frames.
-    def _time_weight_interp(g):
-        g = g.sort_values("Time (s since midnight)").copy()
-        t = g["Time (s since midnight)"].astype(float).to_numpy()
-        h = g["Altitude (m)"].to_numpy(dtype=float)
-        mask_known = ~np.isnan(h)
-        non_na = int(mask_known.sum())
-        if non_na == 0:
-            return g
-        if non_na == 1:
-            single_val = float(h[mask_known][0])
-            g["Altitude (m)"] = single_val
-            return g
-        t_known = t[mask_known]
-        h_known = h[mask_known]
-        h_interp = np.interp(t, t_known, h_known)
-        g["Altitude (m)"] = h_interp
-        return g
-
-    df = df.sort_values("Time (s since midnight)").reset_index(drop=True)
-    df = pd.DataFrame(
-        df.groupby(["Target Identification", "Category"], group_keys=False).apply(
-            _time_weight_interp
-        )
-    )
-
-    # Part 2: Vectorized frame-based processing
-
-    # Define aggregation spec for columns
-    agg_spec = {
-        "Latitude (deg)": "mean",
-        "Longitude (deg)": "mean",
-        "Altitude (m)": "mean",
-        "Height (m)": "first",
-        "Height (ft)": "first",
-        "IAS (kt)": "first",
-        "Magnetic Heading (deg)": "first",
-        "Ground Speed (kts)": "first",
-        "Roll Angle": "first",
-        "GBS": "first",
-        "STAT": "first",
-        "Time String": "first",
-        "Barometric Pressure Setting": "first",
-        "Track Angle": "first",
-        "Ground Speed (kts) BDS": "first",
-        "Track Angle Rate": "first",
-        "TAS": "first",
-        "Magnetic Heading (deg) BDS": "first",
-        "Barometric Altitude Rate": "first",
-        "Inertial Vertical Velocity": "first",
-        "Track Number": "first",
-        "Aircraft Address": "first",
-        "Flight Level (FL)": "first",
-        "Mode-3/A Code": "first",
-        "Is_Pure": "first",
-        "Is_Static": "first",
-        "Mach": "first",
-        "Theta (deg)": "first",
-        "Range (m)": "first",
-        "Range (NM)": "first",
-    }
-
-    # Use only columns that exist in the dataframe
-    agg_spec_filtered = {k: v for k, v in agg_spec.items() if k in df.columns}
-
-    # Aggregate to one record per aircraft/frame
-    agg_df = df.groupby(["Target Identification", "Category", "frame"]).agg(
-        agg_spec_filtered
-    )
-
-    # Get frame ranges for each aircraft
-    frame_ranges = df.groupby(["Target Identification", "Category"])["frame"].agg(
-        ["min", "max"]
-    )
-
-    if frame_ranges.empty:
-        # Return an empty DataFrame with the expected columns if no data
-        return pd.DataFrame(columns=df.columns.tolist() + ["Ground Status"])
-
-    # Create a complete multi-index for all frames of all aircraft
-    new_index_tuples = []
-    for idx, row in frame_ranges.iterrows():
-        aid, cat = idx
-        for frame in range(int(row["min"]), int(row["max"]) + 1):
-            new_index_tuples.append((aid, cat, frame))
+# Repetitive text columns stored as pandas categoricals (integer codes plus a
+# lookup table) once decoded; the per-frame expansion repeats them many times.
+CATEGORICAL_COLUMNS = [
+    "Target Identification",
+    "Mode-3/A Code",
+    "Aircraft Address",
+    "STAT",
+    "Time String",
+]
 
-    multi_index = pd.MultiIndex.from_tuples(
-        new_index_tuples, names=["Target Identification", "Category", "frame"]
-    )
+# Radar position used to georeference the captures (lat/lon in radians).
+RADAR_LAT = (41 + 18 / 60.0 + 2.5184 / 3600.0) * np.pi / 180
+RADAR_LON = (2 + 6 / 60.0 + 7.4095 / 3600.0) * np.pi / 180
+RADAR_ALT = 27.25
+
+# Messages decoded per batch when loading progressively.
+LOAD_BATCH_SIZE = 20_000
+# Minimum time between two extensions of a dashboard that is still loading.
+EXTEND_INTERVAL = 1.0
+# Seconds of recording advanced per playback step. Aircraft positions
+# between frames are interpolated from the raw observations.
+PLAYBACK_STEP = 0.25
+
+
+def encode_categoricals(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert the CATEGORICAL_COLUMNS present in ``df`` in place."""
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    return df
 
-    # Reindex to create rows for all frames, making the data dense
-    per_frame_df = agg_df.reindex(multi_index)
 
-    # Group for vectorized operations
-    grouped = per_frame_df.groupby(level=["Target Identification", "Category"])
+class ViewPrefetcher:
+    """Prepares the dashboard's next view on a worker thread.
 
-    # Interpolate coordinate columns
-    interp_cols = ["Latitude (deg)", "Longitude (deg)", "Altitude (m)", "Roll Angle"]
-    interp_cols_present = [c for c in interp_cols if c in per_frame_df.columns]
+    One view at a time is requested under a key; :meth:`take` hands over
+    the result if it was prepared for that key, waiting for it if the
+    worker is still busy. A request for another key supersedes the
+    pending one.
+    """
 
-    if interp_cols_present:
-        per_frame_df[interp_cols_present] = grouped[interp_cols_present].transform(
-            lambda x: x.interpolate(method="linear", limit_direction="both")
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="view-prefetch"
         )
-
-    # Forward-fill and then back-fill other columns
-    ffill_cols = [c for c in per_frame_df.columns if c not in interp_cols_present]
-    if ffill_cols:
-        per_frame_df[ffill_cols] = grouped[ffill_cols].ffill()
-        per_frame_df[ffill_cols] = grouped[ffill_cols].bfill()
-
-    per_frame_df = per_frame_df.reset_index()
-
-    # Add Time column
-    per_frame_df["Time (s since midnight)"] = per_frame_df["frame"].astype(float)
-
-    # Calculate Ground Status
-    per_frame_df["Ground Status"] = per_frame_df.apply(
-        Dashboard.determine_ground_status, axis=1
-    )
-
-    # Final sort
-    per_frame_df = per_frame_df.sort_values(
-        ["frame", "Target Identification", "Category"]
-    ).reset_index(drop=True)
-
-    return per_frame_df
+        self._key = None
+        self._future = None
+
+    def request(self, key, prepare, *args):
+        """Start ``prepare(*args)`` in the background unless already pending."""
+        if self._future is not None:
+            if self._key == key:
+                return
+            self._future.cancel()
+        self._key = key
+        self._future = self._executor.submit(prepare, *args)
+
+    def take(self, key):
+        """Result prepared for ``key``, or ``None`` if there is none."""
+        if self._future is None or self._key != key:
+            return None
+        future, self._future, self._key = self._future, None, None
+        try:
+            return future.result()
+        except Exception:
+            traceback.print_exc()
+            return None
+
+    def close(self):
+        """Drop the pending request and stop the worker thread."""
+        self._future = self._key = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
 
 def load_messages(
-    data_file: str, parallel: bool = True, max_messages=None, decoder_choice="Python"
+    data_file: str,
+    parallel: bool = True,
+    max_messages=None,
+    decoder_choice="Python",
+    use_cache: bool = True,
 ):
     """Decode ASTERIX data and normalize it for dashboard consumption.
 
     Args:
-        data_file: Path to the .ast capture file.
-        parallel: Whether to fan out CAT decoding across processes.
+        data_file: Path to the .ast capture file, or to a Parquet/Feather
+            export from the dashboard, which is read back without decoding.
+        parallel: Whether to fan out CAT decoding across processes (Python)
+            or across the Rust thread pool (Rust).
         max_messages: Optional hard cap to accelerate debugging.
         decoder_choice: "Python" for local decoder, "Rust" for FFI path.
+        use_cache: Reuse (and store) the result in the on-disk DecodeCache.
 
     Returns:
         DataFrame containing the superset of columns expected by the UI
         filtered to a geographic bounding box and enriched with a frame
         index derived from the numeric timestamp.
     """
-    radar_lat = (41 + 18 / 60.0 + 2.5184 / 3600.0) * np.pi / 180
-    radar_lon = (2 + 6 / 60.0 + 7.4095 / 3600.0) * np.pi / 180
-    radar_alt = 27.25
+    if os.path.splitext(data_file)[1].lower() in TABLE_EXTENSIONS:
+        return _read_exported_table(data_file)
+
+    cache = cache_key = None
+    if use_cache:
+        cache = DecodeCache()
+        cache_key = _cache_key(cache, data_file, decoder_choice, max_messages)
+        df = cache.get(cache_key)
+        if df is not None:
+            print(f"Loaded {len(df)} cached records for {data_file}")
+            return encode_categoricals(df)
 
     if decoder_choice == "Rust":
-        raw_decoded = decoderrs.load(
+        columns = decoderrs.load_columns(
             file_path=data_file,
-            radar_lat=radar_lat,
-            radar_lon=radar_lon,
-            radar_alt=radar_alt,
+            radar_lat=RADAR_LAT,
+            radar_lon=RADAR_LON,
+            radar_alt=RADAR_ALT,
             max_messages=max_messages,
+            parallel=parallel,
+        )
+        if columns is None:
+            raise FileNotFoundError(f"Could not read ASTERIX file: {data_file}")
+        df = _rust_columns_frame(columns)
+    else:  # Python
+        decoder = Decoder()
+        coords_radar = CoordinatesWGS84(RADAR_LAT, RADAR_LON, RADAR_ALT)
+
+        decoded = decoder.load(
+            data_file, parallel, max_messages=max_messages, radar_coords=coords_radar
         )
+        df = pd.DataFrame(decoded).reindex(columns=ALL_EXPECTED_COLUMNS)
+    df = _finish_messages(df)
+    if cache is not None:
+        cache.put(cache_key, df)
+    gc.collect()
+    return df
 
-        # Map Rust decoder output to expected format
-        decoded = []
-        for item in raw_decoded:
-            # Skip messages with no time information
-            time_value = item.get("Time (s since midnight)", None)
 
-            if time_value is None:
-                # print("No time information found for item:", item)
-                continue
+def iter_message_batches(
+    data_file: str,
+    parallel: bool = True,
+    max_messages=None,
+    decoder_choice="Python",
+    use_cache: bool = True,
+    batch_size: int = LOAD_BATCH_SIZE,
+):
+    """Decode a capture progressively for the dashboard.
+
+    Yields ``(df, progress, decoded)`` tuples. ``df`` holds the next batch
+    of messages, normalized like :func:`load_messages`. ``progress`` is the
+    fraction of the capture decoded so far, or ``None`` when it cannot be
+    known (a compressed capture without ``max_messages``). ``decoded``
+    counts the messages read so far. Exports and cache hits arrive as one
+    batch. Batches are written to the cache as they arrive, and the entry
+    is committed once the decode completes.
+    """
+    if os.path.splitext(data_file)[1].lower() in TABLE_EXTENSIONS:
+        df = _read_exported_table(data_file)
+        yield df, 1.0, len(df)
+        return
+
+    cache = cache_key = None
+    if use_cache:
+        cache = DecodeCache()
+        cache_key = _cache_key(cache, data_file, decoder_choice, max_messages)
+        df = cache.get(cache_key)
+        if df is not None:
+            print(f"Loaded {len(df)} cached records for {data_file}")
+            yield encode_categoricals(df), 1.0, len(df)
+            return
 
-            mapped_item = {}
-
-            # Map fields with different names
-            mapped_item["Category"] = item.get("Category", "")
-            mapped_item["SAC"] = item.get("SAC", 0)
-            mapped_item["SIC"] = item.get("SIC", 0)
-            mapped_item["Time (s since midnight)"] = time_value
-            mapped_item["Time String"] = item.get("Time String", "")
-            mapped_item["Latitude (deg)"] = item.get("Latitude (deg)", 0)
-            mapped_item["Longitude (deg)"] = item.get("Longitude (deg)", 0)
-            mapped_item["Height (m)"] = item.get("Height (m)", 0)
-            mapped_item["Height (ft)"] = item.get("Height (ft)", 0)
-            mapped_item["Altitude (m)"] = item.get("Altitude (m)", 0)
-            mapped_item["Altitude (ft)"] = item.get("Altitude (ft)", 0)
-            mapped_item["Range (m)"] = item.get("Range (m)", 0)
-            mapped_item["Range (NM)"] = item.get("Range (NM)", 0)
-            mapped_item["Theta (deg)"] = item.get("Theta (deg)", 0)
-            mapped_item["Mode-3/A Code"] = item.get("Mode-3/A Code", "")
-            mapped_item["Flight Level (FL)"] = item.get("Flight Level (FL)", 0)
-            mapped_item["Aircraft Address"] = item.get("Aircraft Address", "")
-            mapped_item["Target Identification"] = item.get("Target Identification", "")
-            mapped_item["Barometric Pressure Setting"] = item.get(
-                "Barometric Pressure Setting", 0
-            )
-            mapped_item["Roll Angle"] = item.get("Roll Angle", 0)
-            mapped_item["Track Angle"] = item.get("Track Angle", 0)
-            mapped_item["Ground Speed (kts) BDS"] = item.get(
-                "Ground Speed (kts) BDS", 0
-            )
-            mapped_item["Track Angle Rate"] = item.get("Track Angle Rate", 0)
-            mapped_item["TAS"] = item.get("TAS", 0)
-            mapped_item["Magnetic Heading (deg) BDS"] = item.get(
-                "Magnetic Heading (deg) BDS", 0
-            )
-            mapped_item["IAS (kt)"] = item.get("IAS (kt)", 0)
-            mapped_item["Mach"] = item.get("Mach", 0)
-            mapped_item["Barometric Altitude Rate"] = item.get(
-                "Barometric Altitude Rate", 0
-            )
-            mapped_item["Inertial Vertical Velocity"] = item.get(
-                "Inertial Vertical Velocity", 0
-            )
-            mapped_item["Track Number"] = item.get("Track Number", 0)
-            mapped_item["Ground Speed (kts)"] = item.get("Ground Speed (kts)", 0)
-            mapped_item["Magnetic Heading (deg)"] = item.get(
-                "Magnetic Heading (deg)", 0
-            )
-            mapped_item["STAT"] = item.get("STAT", "")
-            mapped_item["GBS"] = item.get("GBS", False)
-            mapped_item["Is_Pure"] = item.get("Is_Pure", False)
-            mapped_item["Is_Static"] = item.get("Is_Static", False)
+    # Uncompressed captures report progress by bytes; otherwise only the
+    # message cap (if any) gives a total.
+    total_bytes = None
+    if detect_compression(data_file) is None:
+        total_bytes = os.path.getsize(data_file)
 
-            decoded.append(mapped_item)
+    def progress(bytes_read, decoded):
+        fractions = []
+        if total_bytes:
+            fractions.append(bytes_read / total_bytes)
+        if max_messages:
+            fractions.append(decoded / max_messages)
+        return min(max(fractions), 1.0) if fractions else None
+
+    if decoder_choice == "Rust":
+        reader = decoderrs.Reader(
+            data_file,
+            RADAR_LAT,
+            RADAR_LON,
+            RADAR_ALT,
+            batch_size=batch_size,
+            columnar=True,
+            max_messages=max_messages,
+            parallel=parallel,
+        )
+        batches = (
+            (_rust_columns_frame(columns), reader.bytes_read) for columns in reader
+        )
     else:  # Python
         decoder = Decoder()
-        coords_radar = CoordinatesWGS84(radar_lat, radar_lon, radar_alt)
-
-        decoded = decoder.load(
-            data_file, parallel, max_messages=max_messages, radar_coords=coords_radar
+        coords_radar = CoordinatesWGS84(RADAR_LAT, RADAR_LON, RADAR_ALT)
+        batches = (
+            (pd.DataFrame(messages).reindex(columns=ALL_EXPECTED_COLUMNS), bytes_read)
+            for messages, bytes_read in decoder.iter_batches(
+                data_file,
+                radar_coords=coords_radar,
+                max_messages=max_messages,
+                mode="process" if parallel else "serial",
+                batch_size=batch_size,
+            )
         )
-    df = pd.DataFrame(decoded).reindex(columns=ALL_EXPECTED_COLUMNS)
+
+    # Batches go to the cache as they are decoded rather than being kept
+    # for one write at the end; an abandoned load leaves no entry behind.
+    writer = cache.writer(cache_key) if cache is not None else None
+    decoded = 0
+    try:
+        for df, bytes_read in batches:
+            decoded += len(df)
+            df = _finish_messages(df)
+            if writer is not None:
+                writer.write(df)
+            yield df, progress(bytes_read, decoded), decoded
+    except BaseException:
+        if writer is not None:
+            writer.discard()
+        raise
+    if writer is not None:
+        writer.commit()
+
+
+def _read_exported_table(data_file: str) -> pd.DataFrame:
+    """Load a Parquet/Feather export of an earlier session (no decoding)."""
+    df = read_table(data_file, restore=True)
+    df = df.reindex(
+        columns=list(dict.fromkeys(ALL_EXPECTED_COLUMNS + df.columns.tolist()))
+    )
+    if "frame" not in df.columns or df["frame"].isna().any():
+        df["frame"] = df["Time (s since midnight)"].astype(int)
+    return encode_categoricals(df.reset_index(drop=True))
+
+
+def _cache_key(cache: DecodeCache, data_file, decoder_choice, max_messages):
+    return cache.key(
+        data_file,
+        decoder=decoder_choice,
+        radar=(RADAR_LAT, RADAR_LON, RADAR_ALT),
+        max_messages=max_messages,
+    )
+
+
+def _rust_columns_frame(columns) -> pd.DataFrame:
+    """DataFrame from decoderrs columns with the Rust-path defaults filled."""
+    # Columns already follow ALL_EXPECTED_COLUMNS; fill the gaps with the
+    # same defaults the per-message Rust mapping has always used.
+    df = pd.DataFrame(columns).dropna(subset=["Time (s since midnight)"])
+    df[RUST_TEXT_COLUMNS] = df[RUST_TEXT_COLUMNS].fillna("")
+    for col in RUST_FLAG_COLUMNS:
+        df[col] = df[col].eq(True)
+    numeric_cols = [
+        col
+        for col in ALL_EXPECTED_COLUMNS
+        if col not in RUST_TEXT_COLUMNS and col not in RUST_FLAG_COLUMNS
+    ]
+    df[numeric_cols] = df[numeric_cols].fillna(0)
+    return df
+
+
+def _finish_messages(df: pd.DataFrame) -> pd.DataFrame:
+    """Add the frame column, keep the map area and encode categoricals."""
     df = df.dropna(subset=["Time (s since midnight)"])
     df = (
         df.assign(frame=df["Time (s since midnight)"].astype(int))
         .query("40.9 < `Latitude (deg)` < 41.7 and 1.5 < `Longitude (deg)` < 2.6")
         .reset_index(drop=True)
     )
-    gc.collect()
-    return df
+    return encode_categoricals(df)
 
 
 class LoadingScreen:
@@ -346,37 +405,69 @@ class LoadingScreen:
 
         dpg.configure_item("load_button", show=False)
         dpg.configure_item("loading_text", show=True)
+        dpg.configure_item("loading_progress", show=True)
 
-        # Start loading in a separate thread to prevent GUI hanging
+        # Start loading in a separate thread to prevent GUI hanging. The
+        # dashboard opens on the first decoded batch; the rest is handed to
+        # it as it arrives.
         def load_in_thread():
+            dashboard = None
             try:
-                df = load_messages(
+                for batch, progress, decoded in iter_message_batches(
                     self.data_file,
                     max_messages=max_messages,
                     decoder_choice=self.decoder_choice,
-                )
-
-                # Schedule UI updates to run on the main thread
-                dpg.configure_item("loading_text", label="Creating dashboard...")
-
-                dashboard = Dashboard(df)
-                self.main_controller.set_dashboard(dashboard)
-                dashboard.create_ui()
-
-                dpg.delete_item("Loading Window")
-                dpg.set_primary_window("Primary Window", True)
+                ):
+                    if dashboard is not None:
+                        dashboard.enqueue_batch(batch, progress, decoded)
+                    elif batch.empty:
+                        self._show_progress(progress, decoded)
+                    else:
+                        dpg.set_value("loading_text", "Creating dashboard...")
+                        dashboard = Dashboard(batch, loading=True)
+                        dashboard.load_progress = progress
+                        dashboard.load_decoded = decoded
+                        self._open_dashboard(dashboard)
+
+                if dashboard is None:
+                    # Nothing inside the map area: open an empty dashboard.
+                    empty = pd.DataFrame(columns=ALL_EXPECTED_COLUMNS)
+                    self._open_dashboard(Dashboard(_finish_messages(empty)))
+                else:
+                    dashboard.finish_loading()
             except Exception as e:
                 print(f"Error: {str(e)}")
                 print(traceback.format_exc())
+                if dashboard is not None:
+                    # Keep what was loaded so far.
+                    dashboard.finish_loading()
+                    return
                 dpg.configure_item("loading_text", label=f"Error: {str(e)}")
                 # Show the load button again so user can retry
                 dpg.configure_item("load_button", show=True)
                 dpg.configure_item("loading_text", show=False)
+                dpg.configure_item("loading_progress", show=False)
 
         # Start the loading thread
         loading_thread = threading.Thread(target=load_in_thread, daemon=True)
         loading_thread.start()
 
+    def _show_progress(self, progress, decoded):
+        """Report decoding progress on the loading screen."""
+        if progress is None:
+            dpg.set_value("loading_text", f"Decoding... {decoded} messages")
+        else:
+            dpg.set_value("loading_text", f"Decoding... {progress:.0%}")
+            dpg.set_value("loading_progress", progress)
+
+    def _open_dashboard(self, dashboard):
+        """Replace the loading screen with ``dashboard``."""
+        dashboard.create_ui()
+        self.main_controller.set_dashboard(dashboard)
+
+        dpg.delete_item("Loading Window")
+        dpg.set_primary_window("Primary Window", True)
+
     def _toggle_load_all(self, sender, app_data):
         """Enable/disable the max-messages input when toggling full loads."""
         self.load_all = app_data
@@ -394,6 +485,8 @@ class LoadingScreen:
         ):
             # dpg.add_file_extension(".*")
             dpg.add_file_extension(".ast")
+            dpg.add_file_extension(".parquet")
+            dpg.add_file_extension(".feather")
 
         with dpg.window(label="Loading", tag="Loading Window", width=400, height=250):
             dpg.add_text("Select ASTERIX data file:")
@@ -431,63 +524,59 @@ class LoadingScreen:
                 label="Load and Run", callback=self._load_callback, tag="load_button"
             )
             dpg.add_text("Loading...", show=False, tag="loading_text")
+            dpg.add_progress_bar(tag="loading_progress", width=-1, show=False)
 
 
 class Dashboard:
     """Manage DearPyGui state, filtering logic, and playback updates."""
 
-    @staticmethod
-    def determine_ground_status(row):
-        """Derive ground/airborne status from CAT48 STAT and CAT21 flags."""
-        if pd.notna(row["STAT"]):
-            stat = row["STAT"]
-            is_ground = "on ground" in stat
-            is_airborne = "airborne" in stat
-            if is_ground and not is_airborne:
-                return "On Ground"
-            if is_airborne and not is_ground:
-                return "Airborne"
-        if pd.notna(row["GBS"]):
-            # GBS is now boolean. True means on ground.
-            if row["GBS"]:
-                return "On Ground"
-            else:  # If GBS is False, it implies airborne based on context
-                return "Airborne"
-        return "Unknown"
-
-    def __init__(self, df: pd.DataFrame):
-        """Prepare filtered/per-frame datasets and GUI caches."""
-        self.df: pd.DataFrame = df
-        self.df["Ground Status"] = self.df.apply(self.determine_ground_status, axis=1)
-        self.per_frame_df: pd.DataFrame = generate_per_frame_df(df)
-        self.per_frame_df = self.per_frame_df.dropna(
-            subset=["Latitude (deg)", "Longitude (deg)"]
+    def __init__(self, df: pd.DataFrame, loading: bool = False):
+        """Prepare filtered/per-frame datasets and GUI caches.
+
+        With ``loading`` set, ``df`` is only the first part of the capture;
+        the loader thread hands over the rest with :meth:`enqueue_batch` and
+        :meth:`finish_loading`.
+        """
+        df["Ground Status"] = ground_status(df)
+        # The decoded messages, kept by their filter engine; batches loaded
+        # later are appended to it.
+        self.message_filters = FilterEngine(df, concat=concat_messages)
+        # Per-frame rows are built on demand around the current frame.
+        self.frames = FrameProvider(df)
+        self._view = None
+        # The view playback reaches next is prepared in the background.
+        self.prefetcher = ViewPrefetcher()
+
+        # Marker/trail series pairs, recycled as aircraft leave the scene.
+        self.series_pool = SeriesPool(
+            self._create_aircraft_series, self._assign_aircraft_series
         )
-
-        self.all_aircraft_keys = [  # type: ignore
-            tuple(x)
-            for x in self.per_frame_df[["Target Identification", "Category"]]
-            .drop_duplicates()
-            .to_numpy()
-        ]
-        self.aircraft_series = {}
-        self.aircraft_trail_segments = {}
         self.series_theme_cache = {}
         self.aircraft_color_cache = {}
         # Number of frames to keep in the visible history trail.
         self.trail_length_frames = 45
-        self.trail_segment_count = 1
-
+        # Level-of-detail rendering (render.py): a fixed set of series for
+        # the most relevant tracks plus batched series for the rest. Off by
+        # default; the "LOD" checkbox switches it on for busy captures.
+        self.lod_enabled = False
+        self.lod_batches = {}
+        self._lod_state = {}
+        self._lod_view = None
+
+        # Playback runs on ``current_time`` (seconds since midnight);
+        # ``current_frame`` is the whole second it falls in.
+        self.current_time = 0.0
         self.current_frame = 0
         self.min_frame = 0
         self.max_frame = 0
-        if not self.per_frame_df.empty:
-            self.min_frame = int(self.per_frame_df["frame"].min())
-            self.max_frame = int(self.per_frame_df["frame"].max())
-            self.current_frame = self.min_frame
+        if len(self.frames):
+            self.min_frame = self.frames.min_frame
+            self.max_frame = self.frames.max_frame
+            self._seek(self.min_frame)
 
         self.is_playing = True
         self.playback_speed = 10.0
+        self.playback_step = PLAYBACK_STEP
         self.last_update_time = 0
         self.clicked_aircraft_key = None
 
@@ -501,88 +590,265 @@ class Dashboard:
         self.lat_max_filter = 41.7
         self.lon_min_filter = 1.5
         self.lon_max_filter = 2.6
-        self.altitude_min_filter = self.per_frame_df["Altitude (m)"].min()
-        self.altitude_max_filter = self.per_frame_df["Altitude (m)"].max()
+        self.altitude_min_filter, self.altitude_max_filter = (
+            self.frames.altitude_range()
+        )
+        self._altitude_range = (self.altitude_min_filter, self.altitude_max_filter)
         self.ground_status_filter = "All"
         self.category_filter = "All"
-        self.categories = ["All"] + self.per_frame_df["Category"].unique().tolist()
+        self.categories = ["All"] + self.frames.categories()
         self.ground_statuses = ["All", "On Ground", "Airborne"]
         self.pure_filter = "All"
         self.static_filter = "All"
         self.pure_statuses = ["All", "Pure", "Not Pure"]
         self.static_statuses = ["All", "Static", "Not Static"]
 
-        self.filtered_per_frame_df: pd.DataFrame = self.per_frame_df.copy()
-        self.filtered_df: pd.DataFrame = self.df.copy()
+        # Progressive loading state, fed by the loader thread.
+        self.loading = loading
+        self.load_progress = None
+        self.load_decoded = len(df)
+        self._pending = queue.Queue()
+        self._next_extend = 0.0
+        self.ui_ready = False
 
-    def _apply_filters(self):
-        """Filters the per_frame_df based on the current filter settings."""
-        filtered_df = self.per_frame_df.copy()
-
-        # Apply filters
-        if not filtered_df.empty:
-            filtered_df = filtered_df[
-                (filtered_df["Latitude (deg)"] >= self.lat_min_filter)
-                & (filtered_df["Latitude (deg)"] <= self.lat_max_filter)
-                & (filtered_df["Longitude (deg)"] >= self.lon_min_filter)
-                & (filtered_df["Longitude (deg)"] <= self.lon_max_filter)
-                & (filtered_df["Altitude (m)"] >= self.altitude_min_filter)
-                & (filtered_df["Altitude (m)"] <= self.altitude_max_filter)
-            ]
+        self._load_view(self.current_frame)
 
-            if self.ground_status_filter != "All":
-                filtered_df = filtered_df[
-                    filtered_df["Ground Status"] == self.ground_status_filter
-                ]
+    @property
+    def df(self) -> pd.DataFrame:
+        """All decoded messages."""
+        return self.message_filters.df
 
-            if self.category_filter != "All":
-                filtered_df = filtered_df[
-                    filtered_df["Category"].astype(str) == self.category_filter
-                ]
-            if self.pure_filter != "All":
-                is_pure = self.pure_filter == "Pure"
-                filtered_df = filtered_df[filtered_df["Is_Pure"] == is_pure]
-
-            if self.static_filter != "All":
-                is_static = self.static_filter == "Static"
-                filtered_df = filtered_df[filtered_df["Is_Static"] == is_static]
-
-        self.filtered_per_frame_df = pd.DataFrame(filtered_df)
-
-        # Filter df
-        filtered_df = self.df.copy()
-        if not filtered_df.empty:
-            # Drop rows with NaN in coordinate columns to avoid errors
-            filtered_df = filtered_df.dropna(
-                subset=["Latitude (deg)", "Longitude (deg)", "Altitude (m)"]
-            )
+    def enqueue_batch(self, batch: pd.DataFrame, progress, decoded):
+        """Hand a decoded batch over from the loader thread."""
+        self._pending.put((batch, progress, decoded))
 
-            filtered_df = filtered_df[
-                (filtered_df["Latitude (deg)"] >= self.lat_min_filter)
-                & (filtered_df["Latitude (deg)"] <= self.lat_max_filter)
-                & (filtered_df["Longitude (deg)"] >= self.lon_min_filter)
-                & (filtered_df["Longitude (deg)"] <= self.lon_max_filter)
-                & (filtered_df["Altitude (m)"] >= self.altitude_min_filter)
-                & (filtered_df["Altitude (m)"] <= self.altitude_max_filter)
-            ]
+    def finish_loading(self):
+        """Tell the dashboard that no more batches will come."""
+        self._pending.put(None)
 
-            if self.ground_status_filter != "All":
-                filtered_df = filtered_df[
-                    filtered_df["Ground Status"] == self.ground_status_filter
-                ]
+    def close(self):
+        """Release the dashboard's worker threads when it is torn down."""
+        self.prefetcher.close()
 
-            if self.category_filter != "All":
-                filtered_df = filtered_df[
-                    filtered_df["Category"].astype(str) == self.category_filter
-                ]
-            if self.pure_filter != "All":
-                is_pure = self.pure_filter == "Pure"
-                filtered_df = filtered_df[filtered_df["Is_Pure"] == is_pure]
+    def _drain_batches(self):
+        """Fold the batches queued by the loader into the dashboard."""
+        if not self.loading or time.time() < self._next_extend:
+            return
+        batches = []
+        while True:
+            try:
+                item = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self.loading = False
+                break
+            batch, self.load_progress, self.load_decoded = item
+            batches.append(batch)
+        started = time.time()
+        if batches:
+            self.extend(concat_messages(batches))
+        # Space the extensions out so playback keeps most of the frame time.
+        elapsed = time.time() - started
+        self._next_extend = time.time() + max(EXTEND_INTERVAL, 4 * elapsed)
+        self._update_load_status()
+
+    def _update_load_status(self):
+        """Show the loader's progress next to the playback controls."""
+        if not self.ui_ready:
+            return
+        dpg.configure_item("load_status", show=self.loading)
+        dpg.configure_item("load_progress", show=self.loading)
+        if not self.loading:
+            return
+        if self.load_progress is None:
+            dpg.set_value("load_status", f"Loading: {self.load_decoded} messages")
+        else:
+            dpg.set_value("load_status", f"Loading: {self.load_progress:.0%}")
+            dpg.set_value("load_progress", self.load_progress)
+
+    def extend(self, batch: pd.DataFrame):
+        """Append newly decoded messages to the dashboard.
+
+        Only the aircraft in ``batch`` are reduced again by the frame
+        provider and only the new rows go through the message filters; the
+        per-frame rows on screen are materialised again.
+        """
+        if batch.empty:
+            return
+        batch["Ground Status"] = ground_status(batch)
+        self.message_filters.extend(batch)
+        self.frames.extend(batch)
+
+        self.min_frame = self.frames.min_frame
+        self.max_frame = self.frames.max_frame
+        self.categories = ["All"] + self.frames.categories()
+        # Follow the data's altitude range until the user sets one.
+        altitude_range = self.frames.altitude_range()
+        follow_altitude = (
+            self.altitude_min_filter,
+            self.altitude_max_filter,
+        ) == self._altitude_range
+        self._altitude_range = altitude_range
+        if follow_altitude:
+            self.altitude_min_filter, self.altitude_max_filter = altitude_range
+
+        self._load_view(self.current_frame, force=True)
+        if self.ui_ready:
+            dpg.configure_item(
+                "frame_slider", min_value=self.min_frame, max_value=self.max_frame
+            )
+            dpg.configure_item("category_filter", items=self.categories)
+            if follow_altitude:
+                dpg.set_value("altitude_min_filter", float(self.altitude_min_filter))
+                dpg.set_value("altitude_max_filter", float(self.altitude_max_filter))
+            self._update_plot()
+
+    def _view_range(self, frame):
+        """Frames of the view drawing ``frame``: whole provider chunks
+        covering the frame and its trail."""
+        first = frame - self.trail_length_frames
+        first = (first // FRAME_CHUNK) * FRAME_CHUNK
+        last = (frame // FRAME_CHUNK + 1) * FRAME_CHUNK - 1
+        return first, last
+
+    def _load_view(self, frame, force=False):
+        """Materialise the per-frame rows needed to draw ``frame``.
+
+        During playback the view only moves every ``FRAME_CHUNK`` frames,
+        and the next one has usually been prepared by the prefetcher, so
+        the render loop just swaps it in. Returns ``True`` if a new view was
+        loaded.
+        """
+        first = frame - self.trail_length_frames
+        if not force and self._view is not None:
+            if self._view[0] <= first and frame <= self._view[1]:
+                return False
+        view = self._view_range(frame)
+        prepared = self.prefetcher.take((self.frames.version, view))
+        if prepared is None:
+            prepared = self._prepare_view(self.frames, view)
+        self._view = view
+        self.per_frame_df, self.per_frame_filters, frame_index, track_index = (
+            prepared
+        )
+        self.frame_index = frame_index
+        self.filtered_per_frame_df = frame_index.df
+        self._reset_track_index(track_index)
+        # Picks up filter changes made while the view was being prepared.
+        self._apply_filters()
 
-            if self.static_filter != "All":
-                is_static = self.static_filter == "Static"
-                filtered_df = filtered_df[filtered_df["Is_Static"] == is_static]
-        self.filtered_df = pd.DataFrame(filtered_df)
+        # Prepare the view after this one; past the end, playback wraps.
+        next_frame = view[1] + 1
+        if next_frame > self.max_frame and not self.loading:
+            next_frame = self.min_frame
+        next_view = self._view_range(next_frame)
+        self.prefetcher.request(
+            (self.frames.version, next_view),
+            self._prepare_view,
+            self.frames,
+            next_view,
+        )
+        return True
+
+    def _prepare_view(self, frames: FrameProvider, view):
+        """Per-frame rows of ``view`` with their filters and indexes.
+
+        Runs on the prefetch thread as well as the main one, so it only
+        reads the dashboard's filter settings.
+        """
+        per_frame_df = (
+            frames.window(*view)
+            .dropna(subset=["Latitude (deg)", "Longitude (deg)"])
+            .reset_index(drop=True)
+        )
+        engine = FilterEngine(per_frame_df)
+        self._configure_filters(engine)
+        frame_index = FrameIndex(engine.subset())
+        return per_frame_df, engine, frame_index, TrackIndex(frame_index.df)
+
+    def _configure_filters(self, engine: FilterEngine) -> bool:
+        """Push the current filter settings into ``engine``.
+
+        Only dimensions whose settings changed are recomputed; returns
+        ``True`` if any did.
+        """
+        changed = engine.set_range(
+            "latitude", "Latitude (deg)", self.lat_min_filter, self.lat_max_filter
+        )
+        changed |= engine.set_range(
+            "longitude", "Longitude (deg)", self.lon_min_filter, self.lon_max_filter
+        )
+        changed |= engine.set_range(
+            "altitude",
+            "Altitude (m)",
+            self.altitude_min_filter,
+            self.altitude_max_filter,
+        )
+        changed |= engine.set_equal(
+            "ground_status",
+            "Ground Status",
+            None if self.ground_status_filter == "All" else self.ground_status_filter,
+        )
+        changed |= engine.set_equal(
+            "category",
+            "Category",
+            None if self.category_filter == "All" else int(self.category_filter),
+        )
+        changed |= engine.set_equal(
+            "pure",
+            "Is_Pure",
+            None if self.pure_filter == "All" else self.pure_filter == "Pure",
+        )
+        changed |= engine.set_equal(
+            "static",
+            "Is_Static",
+            None if self.static_filter == "All" else self.static_filter == "Static",
+        )
+        return changed
+
+    def _apply_filters(self):
+        """Filters the per_frame_df view based on the current filter settings."""
+        if self._configure_filters(self.per_frame_filters):
+            # per_frame_df is frame-sorted, so the subset is too and
+            # FrameIndex only has to compute the offsets.
+            self.frame_index = FrameIndex(self.per_frame_filters.subset())
+            self.filtered_per_frame_df = self.frame_index.df
+            self._reset_track_index()
+        # The message table is only needed for export; its masks are updated
+        # here and the rows taken on demand by ``filtered_df``.
+        self._configure_filters(self.message_filters)
+
+    @property
+    def filtered_df(self) -> pd.DataFrame:
+        """Decoded messages passing the current filters."""
+        return self.message_filters.subset()
+
+    def _reset_track_index(self, track_index=None):
+        """Rebuild per-track arrays and blank the series of the old data.
+
+        ``track_index`` is used instead of building one when given.
+        """
+        self._clear_series()
+        if track_index is None:
+            track_index = TrackIndex(self.filtered_per_frame_df)
+        self.track_index = track_index
+        self._track_of = {key: t for t, key in enumerate(self.track_index.keys)}
+        self._track_category = np.array(
+            [cat for _, cat in self.track_index.keys], dtype=np.int64
+        )
+        self._track_aircraft = self.frames.ids(self.track_index.keys)
+        self.markers = None
+
+    def _clear_series(self):
+        """Blank every aircraft series so the next update redraws from scratch."""
+        self.series_pool.release_all()
+        for marker, trail in self.lod_batches.values():
+            dpg.set_value(marker, ([], []))
+            dpg.set_value(trail, ([], []))
+        self._lod_state.clear()
+        self._plotted_lo = self._plotted_hi = None
+        self._plotted_x = self._plotted_y = None
 
     def _get_aircraft_color(self, key, cat):
         """Return a soft, distinct color per aircraft using pastel HSV hashing."""
@@ -649,17 +915,6 @@ class Dashboard:
             self.series_theme_cache[key] = theme
         return self.series_theme_cache[key]
 
-    def _update_trail_segments(self, key, coords):
-        """Update single translucent trail series for the aircraft."""
-        segments = self.aircraft_trail_segments.get(key, [])
-        if not segments:
-            return
-        seg = segments[0]
-        if not coords or len(coords[0]) < 2:
-            dpg.set_value(seg, ([], []))
-            return
-        dpg.set_value(seg, coords)
-
     def _filter_callback(self, sender, app_data):
         """Callback for all filter UI elements."""
         filter_tag = dpg.get_item_alias(sender)
@@ -695,15 +950,30 @@ class Dashboard:
         """Pause playback when the pause button is pressed."""
         self.is_playing = False
 
+    def _lod_callback(self, sender, app_data):
+        """Switch between per-aircraft series and level-of-detail rendering."""
+        self.lod_enabled = app_data
+        self._clear_series()
+        self._update_plot()
+
     def _speed_callback(self, sender, app_data):
         """Apply the requested frames-per-second value."""
         self.playback_speed = app_data
 
+    def _step_callback(self, sender, app_data):
+        """Apply the requested playback step, in seconds."""
+        self.playback_step = app_data
+
     def _frame_slider_callback(self, sender, app_data):
         """Jump to an arbitrary frame via the slider widget."""
-        self.current_frame = app_data
+        self._seek(app_data)
         self._update_plot()
 
+    def _seek(self, time_s):
+        """Move playback to ``time_s`` seconds since midnight."""
+        self.current_time = float(time_s)
+        self.current_frame = int(np.floor(self.current_time))
+
     def _export_callback(self):
         """Open the export dialog so the user can pick a CSV path."""
         dpg.show_item("export_dialog_id")
@@ -769,85 +1039,177 @@ class Dashboard:
             # Reindex the DataFrame
             df_to_export = self.filtered_df[new_column_order]
 
-            df_to_export.to_csv(file_path, index=False)
+            # CSV, Parquet or Feather depending on the chosen extension.
+            try:
+                write_table(df_to_export, file_path)
+            except ValueError as e:
+                print(f"[ERROR] {e}")
         dpg.configure_item("export_dialog_id", show=False)
 
     def _update_plot(self):
         """Refresh aircraft scatter/trail series for the active frame."""
         if not hasattr(self, "filtered_per_frame_df"):
             return
-        frame_data = self.filtered_per_frame_df[
-            self.filtered_per_frame_df["frame"] == self.current_frame
-        ]
-
-        # Pre-compute recent history for trails so we only slice once.
-        trail_window = self.filtered_per_frame_df[
-            (
-                self.filtered_per_frame_df["frame"]
-                >= self.current_frame - self.trail_length_frames
-            )
-            & (self.filtered_per_frame_df["frame"] <= self.current_frame)
-        ]
-        trail_dict = {}
-        if not trail_window.empty:
-            for key, group in trail_window.groupby(
-                ["Target Identification", "Category"]
-            ):
-                group_df = pd.DataFrame(group).sort_values("frame")
-                trail_dict[key] = (
-                    group_df["Longitude (deg)"].tolist(),
-                    group_df["Latitude (deg)"].tolist(),
-                )
+        self._load_view(self.current_frame)
+        tracks = self.track_index
+        lo, hi = tracks.ranges(
+            self.current_frame - self.trail_length_frames, self.current_frame
+        )
+        at_frame = tracks.at_frame(self.current_frame, lo, hi)
+        x, y = self._marker_positions(lo, hi)
+        # Both drawing modes show a marker for the tracks seen this frame.
+        self.markers = MarkerIndex(x, y, at_frame)
+        if self.lod_enabled:
+            self._update_plot_lod(lo, hi, at_frame, x, y)
+            return
 
-        aircraft_in_frame = set()
-        for _, row in frame_data.iterrows():
-            aid = row["Target Identification"]
-            cat = row["Category"]
-            key = (aid, cat)
-            lon = [row["Longitude (deg)"]]
-            lat = [row["Latitude (deg)"]]
-            if key in self.aircraft_series:
-                dpg.set_value(self.aircraft_series[key], (lon, lat))
-                aircraft_in_frame.add(key)
+        # Only tracks whose visible window moved need new series data.
+        if self._plotted_lo is None:
+            changed = np.arange(len(tracks))
+        else:
+            changed = np.flatnonzero(
+                (lo != self._plotted_lo) | (hi != self._plotted_hi)
+            )
+        for t in changed:
+            key = tracks.keys[t]
+            start, end = lo[t], hi[t]
+            if start == end:
+                # Out of the trail window: hand its series to the next one.
+                self.series_pool.release(key)
+                continue
+            marker, trail = self.series_pool.acquire(key)
+            if end - start >= 2:
+                coords = (tracks.x[start:end].tolist(), tracks.y[start:end].tolist())
             else:
-                # Dynamically create series for new aircraft
-                color = self._get_aircraft_color(key, cat)
-                series = dpg.add_scatter_series(
-                    x=lon,
-                    y=lat,
-                    label=f"{aid}-{cat}",
-                    parent="y_axis",
-                )
-                dpg.bind_item_theme(
-                    series,
-                    self._get_series_theme(dpg.mvScatterSeries, color, cat),
-                )
-                self.aircraft_series[key] = series
-                aircraft_in_frame.add(key)
-
-                # Create trail series for the new aircraft
-                subtler_color = color.copy()
-                subtler_color[3] = 90
-                trail_color = subtler_color.copy()
-                trail_color[3] = 80
-                trail_series = dpg.add_line_series(
-                    x=[], y=[], label="", parent="y_axis"
-                )
-                dpg.bind_item_theme(
-                    trail_series,
-                    self._get_series_theme(dpg.mvLineSeries, trail_color),
-                )
-                self.aircraft_trail_segments[key] = [trail_series]
-
-            if key in self.aircraft_trail_segments:
-                self._update_trail_segments(key, trail_dict.get(key))
+                coords = ([], [])
+            dpg.set_value(trail, coords)
+
+        # Markers also move between frames, with the trail windows unchanged.
+        if self._plotted_x is not None:
+            moved = (x != self._plotted_x) | (y != self._plotted_y)
+            changed = np.union1d(changed, np.flatnonzero(moved))
+        for t in changed:
+            key = tracks.keys[t]
+            if key not in self.series_pool:
+                continue
+            marker, _ = self.series_pool.acquire(key)
+            if at_frame[t]:
+                dpg.set_value(marker, ([float(x[t])], [float(y[t])]))
+            else:
+                dpg.set_value(marker, ([], []))
+        self._plotted_lo, self._plotted_hi = lo, hi
+        self._plotted_x, self._plotted_y = x, y
+
+    def _marker_positions(self, lo, hi):
+        """Per-track marker position at ``current_time``.
+
+        Tracks are placed on their raw observations, interpolated by the
+        frame provider's timelines; tracks without any fall back to their
+        latest frame.
+        """
+        tracks = self.track_index
+        last = np.where(hi > lo, hi - 1, 0)
+        x, y = tracks.x[last], tracks.y[last]
+        timeline_x, timeline_y = self.frames.positions(self.current_time)
+        aircraft = self._track_aircraft
+        known = aircraft >= 0
+        known[known] = ~np.isnan(timeline_x[aircraft[known]])
+        x[known] = timeline_x[aircraft[known]]
+        y[known] = timeline_y[aircraft[known]]
+        return x, y
+
+    def _update_plot_lod(self, lo, hi, at_frame, x, y):
+        """Draw the frame with a bounded number of series (see render.py).
+
+        ``x``/``y`` are the marker positions from :meth:`_marker_positions`.
+        """
+        if not self.lod_batches:
+            return
+        tracks = self.track_index
+        x_limits = tuple(dpg.get_axis_limits("x_axis"))
+        y_limits = tuple(dpg.get_axis_limits("y_axis"))
+        self._lod_view = (x_limits, y_limits)
+        tolerance = view_tolerance(x_limits, dpg.get_item_rect_size("map_plot")[0])
+
+        visible = hi > lo
+        pinned = []
+        if self.clicked_aircraft_key in self._track_of:
+            pinned.append(self._track_of[self.clicked_aircraft_key])
+        detail = select_detail(x, y, visible, x_limits, y_limits, DETAIL_LIMIT, pinned)
+
+        detail_keys = {tracks.keys[t]: t for t in detail}
+        for key in list(self.series_pool.active):
+            if key not in detail_keys:
+                self.series_pool.release(key)
+                self._lod_state.pop(key, None)
+        for key, t in detail_keys.items():
+            marker, trail = self.series_pool.acquire(key)
+            state = (lo[t], hi[t], tolerance, x[t], y[t])
+            if self._lod_state.get(key) == state:
+                continue
+            self._lod_state[key] = state
+            if at_frame[t]:
+                dpg.set_value(marker, ([float(x[t])], [float(y[t])]))
+            else:
+                dpg.set_value(marker, ([], []))
+            trail_x, trail_y = trail_polyline(tracks, lo, hi, [t], tolerance)
+            dpg.set_value(trail, (trail_x.tolist(), trail_y.tolist()))
+
+        batched = visible.copy()
+        batched[detail] = False
+        other = ~np.isin(self._track_category, LOD_CATEGORIES)
+        for cat, (marker, trail) in self.lod_batches.items():
+            members = batched & (other if cat is None else self._track_category == cat)
+            shown = members & at_frame
+            dpg.set_value(marker, (x[shown].tolist(), y[shown].tolist()))
+            trail_x, trail_y = trail_polyline(tracks, lo, hi, members, tolerance)
+            dpg.set_value(trail, (trail_x.tolist(), trail_y.tolist()))
+
+    def _create_lod_series(self):
+        """Create the fixed series used by level-of-detail rendering."""
+        batch_color = [170, 180, 200, 160]
+        batch_trail_color = [170, 180, 200, 50]
+        for cat in LOD_CATEGORIES + (None,):
+            trail = dpg.add_line_series(x=[], y=[], label="", parent="y_axis")
+            dpg.bind_item_theme(
+                trail, self._get_series_theme(dpg.mvLineSeries, batch_trail_color)
+            )
+            marker = dpg.add_scatter_series(
+                x=[],
+                y=[],
+                label=f"CAT{cat}" if cat is not None else "Other",
+                parent="y_axis",
+            )
+            dpg.bind_item_theme(
+                marker, self._get_series_theme(dpg.mvScatterSeries, batch_color, cat)
+            )
+            self.lod_batches[cat] = (marker, trail)
+
+    def _create_aircraft_series(self):
+        """Create an empty scatter marker and trail series pair."""
+        marker = dpg.add_scatter_series(x=[], y=[], label="", parent="y_axis")
+        trail = dpg.add_line_series(x=[], y=[], label="", parent="y_axis")
+        return marker, trail
+
+    def _assign_aircraft_series(self, pair, key):
+        """Label and colour a series pair for the aircraft ``key``."""
+        aid, cat = key
+        marker, trail = pair
+        color = self._get_aircraft_color(key, cat)
+        dpg.configure_item(marker, label=f"{aid}-{cat}")
+        dpg.bind_item_theme(
+            marker,
+            self._get_series_theme(dpg.mvScatterSeries, color, cat),
+        )
 
-        # Iterate over a copy of the keys to avoid RuntimeError
-        for key in list(self.aircraft_series):
-            if key not in aircraft_in_frame:
-                dpg.set_value(self.aircraft_series[key], ([], []))
-            if key in self.aircraft_trail_segments and key not in trail_dict:
-                self._update_trail_segments(key, None)
+        subtler_color = color.copy()
+        subtler_color[3] = 90  # Softer alpha for the trails
+        trail_color = subtler_color.copy()
+        trail_color[3] = 80  # high transparency
+        dpg.bind_item_theme(
+            trail,
+            self._get_series_theme(dpg.mvLineSeries, trail_color),
+        )
 
     def _mouse_wheel_callback(self, sender, app_data):
         """Callback for mouse wheel events for zooming."""
@@ -887,6 +1249,8 @@ class Dashboard:
             default_filename="filtered_data.csv",
         ):
             dpg.add_file_extension(".csv")
+            dpg.add_file_extension(".parquet")
+            dpg.add_file_extension(".feather")
 
         with dpg.window(tag="Primary Window"):
             with dpg.group(horizontal=True):
@@ -899,6 +1263,27 @@ class Dashboard:
                     default_value=self.playback_speed,
                     callback=self._speed_callback,
                 )
+                dpg.add_input_float(
+                    label="Step (s)",
+                    width=100,
+                    min_value=0.05,
+                    max_value=10.0,
+                    min_clamped=True,
+                    max_clamped=True,
+                    step=0.05,
+                    format="%.2f",
+                    default_value=self.playback_step,
+                    callback=self._step_callback,
+                )
+                dpg.add_checkbox(
+                    label="LOD",
+                    default_value=self.lod_enabled,
+                    callback=self._lod_callback,
+                )
+                dpg.add_progress_bar(
+                    tag="load_progress", width=150, show=self.loading
+                )
+                dpg.add_text("", tag="load_status", show=self.loading)
 
             dpg.add_slider_int(
                 label="Frame",
@@ -947,45 +1332,9 @@ class Dashboard:
                     parent="y_axis",
                 )
 
-                # Create scatter series for each aircraft with category-specific markers and colors
-                # print(
-                #     f"DEBUG: Creating {len(self.all_aircraft_keys)} aircraft series..."
-                # )
-                for aid, cat in self.all_aircraft_keys:
-                    key = (aid, cat)
-                    color = self._get_aircraft_color(key, cat)
-                    subtler_color = color.copy()
-                    subtler_color[3] = 90  # Softer alpha for the trails
-
-                    series = dpg.add_scatter_series(
-                        x=[],
-                        y=[],
-                        label=f"{aid}-{cat}",
-                        parent="y_axis",
-                    )
-                    dpg.bind_item_theme(
-                        series,
-                        self._get_series_theme(dpg.mvScatterSeries, color, cat),
-                    )
-
-                    self.aircraft_series[key] = series
-                    trail_color = subtler_color.copy()
-                    trail_color[3] = 80  # high transparency
-                    trail_series = dpg.add_line_series(
-                        x=[],
-                        y=[],
-                        label="",
-                        parent="y_axis",
-                    )
-                    dpg.bind_item_theme(
-                        trail_series,
-                        self._get_series_theme(dpg.mvLineSeries, trail_color),
-                    )
-                    self.aircraft_trail_segments[key] = [trail_series]
-                #     print(f"DEBUG: Created series {key} -> {series}")
-                # print(
-                #     f"DEBUG: Total aircraft series created: {len(self.aircraft_series)}"
-                # )
+                # Per-aircraft series come from series_pool as aircraft
+                # appear; LOD mode adds these batched series.
+                self._create_lod_series()
             with dpg.tooltip(parent="y_axis", tag="plot_tooltip"):
                 dpg.add_text("", tag="tooltip_text")
 
@@ -1080,6 +1429,8 @@ class Dashboard:
         self._apply_filters()
         self._update_plot()
         self.last_update_time = time.time()
+        self.ui_ready = True
+        self._update_load_status()
 
     def update(self):
         """Advance animation, update hover tooltips, and sync click info."""
@@ -1101,22 +1452,41 @@ class Dashboard:
             # Skip updates during resize to prevent lag
             return
 
-        # Animation logic
+        self._drain_batches()
+
+        # Animation logic: ``playback_speed`` frames (seconds of recording)
+        # per second, advanced in steps of ``playback_step`` seconds.
         if self.is_playing:
-            time_per_frame = 1.0 / self.playback_speed
+            time_per_step = self.playback_step / self.playback_speed
             now = time.time()
-            if now - self.last_update_time >= time_per_frame:
-                self.current_frame += 1
-                if self.current_frame > self.max_frame:
-                    self.current_frame = self.min_frame
+            if now - self.last_update_time > max(2 * time_per_step, 0.5):
+                # Resuming after a pause or a stall: one step, no catching up.
+                self.last_update_time = now - time_per_step
+            steps = int((now - self.last_update_time) / time_per_step)
+            if steps:
+                current_time = self.current_time + steps * self.playback_step
+                if current_time >= self.max_frame + 1:
+                    # While loading, wait at the end for more data.
+                    if self.loading:
+                        current_time = max(self.current_time, self.max_frame)
+                    else:
+                        current_time = self.min_frame
+                self._seek(current_time)
                 dpg.set_value("frame_slider", self.current_frame)
                 self._update_plot()
-                self.last_update_time = now
+                self.last_update_time += steps * time_per_step
+
+        # In LOD mode what is drawn depends on the view; redraw on pan/zoom.
+        if self.lod_enabled and self._lod_view is not None:
+            view = (
+                tuple(dpg.get_axis_limits("x_axis")),
+                tuple(dpg.get_axis_limits("y_axis")),
+            )
+            if view != self._lod_view:
+                self._update_plot()
 
         # Hover and click logic
-        frame_data = self.filtered_per_frame_df[
-            self.filtered_per_frame_df["frame"] == self.current_frame
-        ]
+        frame_data = self.frame_index.frame(self.current_frame)
 
         closest_aircraft = None
         is_hovering_plot = dpg.is_item_hovered("map_plot")
@@ -1128,27 +1498,26 @@ class Dashboard:
             plot_limits_x = dpg.get_axis_limits("x_axis")
             plot_width_units = plot_limits_x[1] - plot_limits_x[0]
             threshold = plot_width_units / 100
-            threshold_sq = threshold * threshold
-
-            min_dist_sq = float("inf")
 
-            for _, row in frame_data.iterrows():
-                px, py = row["Longitude (deg)"], row["Latitude (deg)"]
-                dist_sq = (mx - px) ** 2 + (my - py) ** 2
-                if dist_sq < min_dist_sq:
-                    min_dist_sq = dist_sq
-                    closest_aircraft = row
+            # Hit-test the markers where they are drawn, between frames.
+            track = None
+            if self.markers is not None:
+                track = self.markers.nearest(mx, my, threshold)
+            if track is not None:
+                aid, cat = self.track_index.keys[track]
+                rows = frame_data[
+                    (frame_data["Target Identification"] == aid)
+                    & (frame_data["Category"] == cat)
+                ]
+                if not rows.empty:
+                    closest_aircraft = rows.iloc[0]
 
-            if (
-                closest_aircraft is not None
-                and not closest_aircraft.empty
-                and min_dist_sq < threshold_sq
-            ):
+            if closest_aircraft is not None:
                 info = (
                     f"ID: {closest_aircraft['Target Identification']}\n"
                     f"Category: {closest_aircraft['Category']}\n"
                     f"Altitude: {closest_aircraft['Altitude (m)']:.2f} m\n"
-                    f"Time: {closest_aircraft['Time (s since midnight)']} s"
+                    f"Time: {self.current_time:.2f} s"
                 )
                 ias_value = closest_aircraft.get("IAS (kt)")
                 if ias_value is not None and pd.notna(ias_value):
@@ -1170,8 +1539,6 @@ class Dashboard:
                     info += f"\nSTAT: {stat_value}"
 
                 dpg.set_value("tooltip_text", info)
-            else:
-                closest_aircraft = None  # Reset if not close enough
 
         if (
             dpg.is_item_clicked("map_plot")
@@ -1197,9 +1564,7 @@ class Dashboard:
                 dpg.set_value(
                     "clicked_altitude", f"Altitude: {aircraft['Altitude (m)']:.2f} m"
                 )
-                dpg.set_value(
-                    "clicked_time", f"Time: {aircraft['Time (s since midnight)']} s"
-                )
+                dpg.set_value("clicked_time", f"Time: {self.current_time:.2f} s")
 
                 # Add IAS, GS, Heading, and Roll Angle
                 if pd.notna(aircraft.get("IAS (kt)")):
@@ -1247,6 +1612,8 @@ class MainController:
 
     def set_dashboard(self, dashboard):
         """Store the active dashboard instance created by the loader."""
+        if self.dashboard is not None and self.dashboard is not dashboard:
+            self.dashboard.close()
         self.dashboard = dashboard
 
     def run(self):
@@ -1269,6 +1636,8 @@ class MainController:
                 self.dashboard.update()
             dpg.render_dearpygui_frame()
 
+        if self.dashboard:
+            self.dashboard.close()
         dpg.destroy_context()
 
 
@@ -2,7 +2,7 @@ import argparse
 from time import time
 from rich import print
 import numpy as np
-from .decoder import Decoder
+from .decoder import DECODE_MODES, Decoder
 from .geoutils import CoordinatesWGS84
 
 
@@ -13,12 +13,23 @@ def parse_args():
     parser.add_argument("--test-adsb", action="store_true", help="Use test ADS-B data")
     parser.add_argument("--test-all", action="store_true", help="Use all test data")
     parser.add_argument("--parallel", action="store_true", help="Use parallel decoding")
+    parser.add_argument(
+        "--mode",
+        choices=DECODE_MODES,
+        default=None,
+        help="Decoding backend (overrides --parallel)",
+    )
     parser.add_argument(
         "--max-messages",
         type=int,
         default=None,
         help="Maximum number of messages to decode",
     )
+    parser.add_argument(
+        "--output",
+        default="decoded_adsb_data.csv",
+        help="CSV file written with the decoded messages",
+    )
     return parser.parse_args()
 
 
@@ -42,6 +53,7 @@ if __name__ == "__main__":
             args.parallel,
             max_messages=args.max_messages,
             radar_coords=coords_radar,
+            mode=args.mode,
         )
     if args.test_adsb:
         decoder = Decoder()
@@ -50,6 +62,7 @@ if __name__ == "__main__":
             args.parallel,
             max_messages=args.max_messages,
             radar_coords=coords_radar,
+            mode=args.mode,
         )
     if args.test_all:
         decoder = Decoder()
@@ -58,10 +71,11 @@ if __name__ == "__main__":
             args.parallel,
             max_messages=args.max_messages,
             radar_coords=coords_radar,
+            mode=args.mode,
         )
     if decoded and decoder:
         print(f"Decoded {len(decoded)} messages")
         # print(decoded)
         print(f"Elapsed Time: {time()-start} s")
         print(decoded)
-        decoder.export_to_csv(decoded)
+        decoder.export_to_csv(decoded, output_csv=args.output)
@@ -649,8 +649,13 @@ def decode_cat48(
     len_bytes,
     data: bitstring.BitArray,
     radar_coords: CoordinatesWGS84 | None = None,
+    geo_utils: GeoUtils | None = None,
 ):
-    """Optimized version using position tracking to avoid repeated slicing."""
+    """Optimized version using position tracking to avoid repeated slicing.
+
+    ``geo_utils`` lets callers share one GeoUtils instance (and its cached
+    radar rotation/translation matrices) across many messages.
+    """
     if cat != 48:
         raise ValueError("Category must be 48 for DecodeCat48")
     # Assume data starts from FSPEC (after CAT and LEN octets). Original start=8, but logic is on pos=0.
@@ -746,13 +751,12 @@ def decode_cat48(
         coords_polar = CoordinatesPolar(r, theta_rad, elevation_rad)
         coords_cart = GeoUtils.change_radar_spherical_2_radar_cartesian(coords_polar)
         if coords_cart:
-            coords_geocentric = GeoUtils().change_radar_cartesian_2_geocentric(
+            geo = geo_utils if geo_utils is not None else GeoUtils()
+            coords_geocentric = geo.change_radar_cartesian_2_geocentric(
                 radar_coordinates=radar_coords, cartesian_coordinates=coords_cart
             )
             if coords_geocentric:
-                coords_geodesic = GeoUtils().change_geocentric_2_geodesic(
-                    coords_geocentric
-                )
+                coords_geodesic = geo.change_geocentric_2_geodesic(coords_geocentric)
                 if coords_geodesic:
                     decoded["Latitude (deg)"] = float(
                         coords_geodesic.lat * 180.0 / np.pi
@@ -0,0 +1,63 @@
+"""Transparent access to compressed captures (gzip, xz, bzip2, zstd).
+
+The format is detected from the file's magic bytes, so ``.ast.gz`` or a
+renamed archive both work. Data is decompressed as a stream; nothing is
+written to disk. zstd needs the stdlib ``compression.zstd`` (Python 3.14+)
+or the optional ``zstandard`` package.
+"""
+
+import bz2
+import gzip
+import lzma
+
+try:
+    from compression import zstd as _zstd
+except ImportError:
+    _zstd = None
+    try:
+        import zstandard as _zstandard
+    except ImportError:
+        _zstandard = None
+
+MAGICS = {
+    "gzip": b"\x1f\x8b\x08",
+    "xz": b"\xfd7zXZ\x00",
+    "bz2": b"BZh",
+    "zstd": b"\x28\xb5\x2f\xfd",
+}
+
+
+def detect_compression(file_name):
+    """Return "gzip", "xz", "bz2", "zstd" or ``None`` for a raw capture."""
+    with open(file_name, "rb") as f:
+        head = f.read(6)
+    for name, magic in MAGICS.items():
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def open_capture(file_name, compression=None):
+    """Open a capture for binary reading, decompressing on the fly.
+
+    ``compression`` defaults to :func:`detect_compression`.
+    """
+    if compression is None:
+        compression = detect_compression(file_name)
+    if compression is None:
+        return open(file_name, "rb")
+    if compression == "gzip":
+        return gzip.open(file_name, "rb")
+    if compression == "xz":
+        return lzma.open(file_name, "rb")
+    if compression == "bz2":
+        return bz2.open(file_name, "rb")
+    if compression == "zstd":
+        if _zstd is not None:
+            return _zstd.open(file_name, "rb")
+        if _zstandard is not None:
+            return _zstandard.open(file_name, "rb")
+        raise ImportError(
+            f"{file_name} is zstd-compressed; install 'zstandard' to read it"
+        )
+    raise ValueError(f"Unknown compression {compression!r}")
@@ -1,19 +1,79 @@
+import mmap
+import os
+from contextlib import contextmanager
+from functools import partial
+from itertools import islice
+
 import pandas as pd
 import bitstring
 from tqdm import tqdm
+from concurrent.futures import ThreadPoolExecutor
 from multiprocessing import Pool, cpu_count
 from rich import print
 from .cat21 import decode_cat21
 
 from .cat48 import decode_cat48
+from .compression import detect_compression, open_capture
+from .export import (
+    DEFAULT_CSV_COLUMNS,
+    CsvStreamWriter,
+    flatten_messages,
+    write_table,
+)
+from .framing import iter_blocks, iter_stream_blocks
+from .geoutils import GeoUtils
+from .pcap import iter_pcap_blocks
+from .records import RecordTable
+
+# Execution strategies accepted by Decoder.load(mode=...)
+DECODE_MODES = ("serial", "process", "thread")
+
+
+def default_workers():
+    """Worker count shared by the process and thread backends."""
+    return max(1, min(cpu_count() - 1, 8))
+
+
+def _resolve_mode(parallel, mode, workers):
+    """Apply the ``parallel``/``mode``/``workers`` defaults of Decoder.load."""
+    if mode is None:
+        mode = "process" if parallel else "serial"
+    if mode not in DECODE_MODES:
+        raise ValueError(f"Unknown decode mode {mode!r}, expected {DECODE_MODES}")
+    if workers is None:
+        workers = default_workers()
+    return mode, workers
+
+
+@contextmanager
+def _mapper(mode, workers):
+    """``map`` over the backend of ``mode``, kept open for several batches."""
+    if mode == "process":
+        pool = Pool(processes=workers)
+        try:
+            yield pool.map
+        finally:
+            pool.terminate()
+    elif mode == "thread":
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            yield executor.map
+    else:
+        yield map
+
+
+def _finish(results, max_messages):
+    """Apply the message cap."""
+    if max_messages is not None:
+        results = results[:max_messages]
+    return results
 
 
 class Decoder:
     """Utility for parsing ASTERIX binary streams into CAT-specific dicts."""
 
     def __init__(self):
-        """Nothing to initialize yet; placeholder for future config."""
-        pass
+        """Hold a shared GeoUtils so radar transform matrices are cached once."""
+        self.geo_utils = GeoUtils()
 
     def split_data(self, bit_data, max_messages=None):
         """Split the raw bit array into (CAT, length, payload) tuples."""
@@ -42,31 +102,331 @@ class Decoder:
 
         return result
 
+    def split_buffer(self, buffer, max_messages=None):
+        """Split an in-memory capture into (CAT, length, payload) tuples.
+
+        Framing runs over a memoryview of ``buffer``; only each payload is
+        copied into the bitstring handed to the CAT decoders.
+        """
+        result = []
+        with tqdm(total=memoryview(buffer).nbytes, desc="Splitting") as pbar:
+            for cat, length, body in iter_blocks(buffer, max_messages):
+                result.append((cat, length, bitstring.Bits(bytes=body)))
+                pbar.update(length)
+        return result
+
+    def split_stream(self, stream, max_messages=None):
+        """Split a binary stream (e.g. a decompressing reader) into tuples."""
+        result = []
+        with tqdm(desc="Splitting", unit="B", unit_scale=True) as pbar:
+            for cat, length, body in iter_stream_blocks(stream, max_messages):
+                result.append((cat, length, bitstring.Bits(bytes=body)))
+                pbar.update(length)
+        return result
+
+    def decode_block(self, cat, length, body, radar_coords=None):
+        """Decode one ASTERIX data block, e.g. as framed by ``iter_blocks``.
+
+        ``body`` is the block payload after its 3-byte header (bytes or a
+        memoryview). Returns the record dict, or ``None`` for categories
+        other than 21 and 48.
+        """
+        return self._decode_element(
+            (cat, length, bitstring.Bits(bytes=body)), radar_coords=radar_coords
+        )
+
     def _decode_element(self, element, radar_coords=None):
         """Decode a single ASTERIX element, delegating to CAT handlers."""
         cat, length, data = element
         if cat == 48:
-            return decode_cat48(cat, length, data, radar_coords=radar_coords)
+            return decode_cat48(
+                cat, length, data, radar_coords=radar_coords, geo_utils=self.geo_utils
+            )
         elif cat == 21:
             return decode_cat21(cat, length, data)
         return None
 
-    def load(self, file_name, parallel=True, max_messages=None, radar_coords=None):
-        """Read an ASTERIX file, split it, and decode all messages."""
-        with open(file_name, "rb") as f:
-            data = f.read()
-        bit_data = bitstring.BitArray(data)
-        print(f"Loaded {len(data)} bytes from {file_name}")
-        splitted_data = self.split_data(bit_data, max_messages)
-        decoded_messages = []
+    def load(
+        self,
+        file_name,
+        parallel=True,
+        max_messages=None,
+        radar_coords=None,
+        mode=None,
+        workers=None,
+        compact=False,
+    ):
+        """Read an ASTERIX file, split it, and decode all messages.
 
-        # Create a partial function with radar_coords
-        from functools import partial
+        Args:
+            file_name: Path to the .ast capture, optionally gzip/xz/bz2/zstd
+                compressed (detected from the magic bytes).
+            parallel: Legacy switch; True selects the "process" mode and
+                False the "serial" one when ``mode`` is not given.
+            max_messages: Optional cap on the number of decoded messages.
+            radar_coords: Radar position used to georeference CAT48 plots.
+            mode: One of ``DECODE_MODES``. "thread" decodes on a
+                ThreadPoolExecutor so workers share the memory-mapped input
+                and the radar transform cache without pickling; it pays off
+                on free-threaded builds or when decoding releases the GIL.
+            workers: Pool size for the process/thread modes.
+            compact: Return a :class:`~decoder.records.RecordTable` (typed
+                columns, categorical codes for strings) instead of a list of
+                dicts; it takes several times less memory. The table is
+                built batch by batch from :meth:`iter_batches`, so the dicts
+                of the whole capture are never held at once. Undecodable
+                blocks, ``None`` entries in the list, get no row in the
+                table, so table rows do not line up with list positions.
+        """
+        if os.path.getsize(file_name) == 0:
+            print(f"Loaded 0 bytes from {file_name}")
+            return RecordTable.from_messages([]) if compact else []
+        if compact:
+            mode, workers = _resolve_mode(parallel, mode, workers)
+            batches = self.iter_batches(
+                file_name, radar_coords, max_messages, mode, workers
+            )
+            return RecordTable.from_batches(messages for messages, _ in batches)
+        compression = detect_compression(file_name)
+        if compression is not None:
+            # Decompress in chunks straight into the splitter; no temporary
+            # decompressed copy is written.
+            mode, workers = _resolve_mode(parallel, mode, workers)
+            with open_capture(file_name, compression) as stream:
+                splitted_data = self.split_stream(stream, max_messages)
+            print(f"Loaded {len(splitted_data)} blocks from {file_name} ({compression})")
+            results = self._decode_all(splitted_data, mode, workers, radar_coords)
+            return _finish(results, max_messages)
+        # The capture is memory-mapped rather than read into the heap; thread
+        # workers all slice the same mapping.
+        with open(file_name, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            print(f"Loaded {len(mapped)} bytes from {file_name}")
+            return self.load_buffer(
+                mapped,
+                mode=mode or ("process" if parallel else "serial"),
+                max_messages=max_messages,
+                radar_coords=radar_coords,
+                workers=workers,
+            )
+
+    def load_buffer(
+        self,
+        buffer,
+        parallel=True,
+        max_messages=None,
+        radar_coords=None,
+        mode=None,
+        workers=None,
+        compact=False,
+    ):
+        """Decode ASTERIX data already in memory.
+
+        ``buffer`` is any buffer-protocol object (``bytes``, ``bytearray``,
+        ``memoryview``, ``mmap``...), e.g. a datagram, an archive member or a
+        test fixture; it is framed in place without copying, so it must not
+        be written to until the call returns. Arguments otherwise match
+        :meth:`load`.
+        """
+        mode, workers = _resolve_mode(parallel, mode, workers)
+        if compact:
+            blocks = iter_blocks(buffer, max_messages)
+            batches = self._decode_batches(blocks, radar_coords, mode, workers)
+            return RecordTable.from_batches(messages for messages, _ in batches)
+
+        splitted_data = self.split_buffer(buffer, max_messages)
+        results = self._decode_all(splitted_data, mode, workers, radar_coords)
+        return _finish(results, max_messages)
+
+    def load_pcap(
+        self,
+        file_name,
+        ports=None,
+        groups=None,
+        parallel=True,
+        max_messages=None,
+        radar_coords=None,
+        mode=None,
+        workers=None,
+        batch_size=10_000,
+    ):
+        """Decode the ASTERIX carried in the UDP datagrams of a pcap/pcapng file.
+
+        ``ports`` and ``groups`` restrict the destination ports and addresses
+        (e.g. multicast groups) that are read. Each decoded record gets a
+        "Capture Time" entry with the POSIX capture timestamp of its datagram
+        (``None`` for pcapng simple packet blocks). Undecodable blocks are
+        ``None``, as in :meth:`load`. The records are collected from
+        :meth:`iter_pcap_batches`, which streams them instead. Other
+        arguments match :meth:`load`.
 
+        Raises:
+            ValueError: If the file is not a pcap/pcapng capture.
+        """
+        mode, workers = _resolve_mode(parallel, mode, workers)
+        results = []
+        for records in self._pcap_batches(
+            file_name,
+            ports,
+            groups,
+            radar_coords,
+            max_messages,
+            mode,
+            workers,
+            batch_size,
+        ):
+            results.extend(records)
+        return results
+
+    def iter_pcap_batches(
+        self,
+        file_name,
+        ports=None,
+        groups=None,
+        radar_coords=None,
+        max_messages=None,
+        mode="serial",
+        workers=None,
+        batch_size=10_000,
+    ):
+        """Decode a pcap/pcapng capture lazily in batches of ``batch_size`` blocks.
+
+        Yields the decoded records of each batch, stamped with "Capture
+        Time" like :meth:`load_pcap` (undecodable blocks are skipped), so
+        only one batch is held at a time however long the capture is.
+
+        Raises:
+            ValueError: If the file is not a pcap/pcapng capture.
+        """
+        mode, workers = _resolve_mode(False, mode, workers)
+        for records in self._pcap_batches(
+            file_name,
+            ports,
+            groups,
+            radar_coords,
+            max_messages,
+            mode,
+            workers,
+            batch_size,
+        ):
+            yield [record for record in records if record is not None]
+
+    def _pcap_batches(
+        self,
+        file_name,
+        ports,
+        groups,
+        radar_coords,
+        max_messages,
+        mode,
+        workers,
+        batch_size,
+    ):
+        """Yield the records (``None`` if undecodable) of each pcap batch."""
+        if os.path.getsize(file_name) == 0:
+            return
+        decode_func = partial(self._decode_element, radar_coords=radar_coords)
+        with open(file_name, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            print(f"Loaded {len(mapped)} bytes from {file_name}")
+            blocks = iter_pcap_blocks(mapped, ports, groups, max_messages)
+            with _mapper(mode, workers) as map_func, tqdm(
+                desc="Decoding", unit="Msg"
+            ) as pbar:
+                while True:
+                    chunk = list(islice(blocks, batch_size))
+                    if not chunk:
+                        break
+                    timestamps = [timestamp for timestamp, _, _, _ in chunk]
+                    batch = [
+                        (cat, length, bitstring.Bits(bytes=body))
+                        for _, cat, length, body in chunk
+                    ]
+                    # Drop the payload views so the mapping can be closed.
+                    chunk = None
+                    records = list(map_func(decode_func, batch))
+                    for record, timestamp in zip(records, timestamps):
+                        if record is not None:
+                            record["Capture Time"] = timestamp
+                    pbar.update(len(batch))
+                    yield records
+
+    def iter_messages(
+        self,
+        file_name,
+        radar_coords=None,
+        max_messages=None,
+        mode="serial",
+        workers=None,
+        batch_size=10_000,
+    ):
+        """Decode a capture lazily, yielding one message dict at a time.
+
+        Unlike :meth:`load`, only one batch of ``batch_size`` blocks is held
+        in memory, so arbitrarily long (or compressed) recordings can be
+        streamed into :meth:`export_to_csv`. Undecodable blocks are skipped.
+        """
+        for messages, _ in self.iter_batches(
+            file_name, radar_coords, max_messages, mode, workers, batch_size
+        ):
+            yield from messages
+
+    def iter_batches(
+        self,
+        file_name,
+        radar_coords=None,
+        max_messages=None,
+        mode="serial",
+        workers=None,
+        batch_size=10_000,
+    ):
+        """Decode a capture lazily in batches of ``batch_size`` blocks.
+
+        Yields ``(messages, bytes_read)`` pairs: the decoded message dicts
+        of the batch (undecodable blocks are skipped) and the number of
+        (decompressed) capture bytes consumed so far, for progress reports.
+        """
+        mode, workers = _resolve_mode(False, mode, workers)
+        bytes_read = 0
+        with open_capture(file_name) as stream:
+            blocks = iter_stream_blocks(stream, max_messages)
+            for messages, size in self._decode_batches(
+                blocks, radar_coords, mode, workers, batch_size
+            ):
+                bytes_read += size
+                yield messages, bytes_read
+
+    def _decode_batches(self, blocks, radar_coords, mode, workers, batch_size=10_000):
+        """Decode ``(cat, length, body)`` blocks ``batch_size`` at a time.
+
+        Yields the messages decoded from each batch (undecodable blocks are
+        skipped) and the number of bytes the batch covered.
+        """
+        decode_func = partial(self._decode_element, radar_coords=radar_coords)
+        with _mapper(mode, workers) as map_func, tqdm(
+            desc="Decoding", unit="Msg"
+        ) as pbar:
+            while True:
+                batch = [
+                    (cat, length, bitstring.Bits(bytes=body))
+                    for cat, length, body in islice(blocks, batch_size)
+                ]
+                if not batch:
+                    break
+                results = map_func(decode_func, batch)
+                messages = [message for message in results if message is not None]
+                pbar.update(len(batch))
+                yield messages, sum(length for _, length, _ in batch)
+
+    def _decode_all(self, splitted_data, mode, workers, radar_coords):
+        """Decode split (CAT, length, payload) tuples with the given backend."""
+        # Create a partial function with radar_coords
         decode_func = partial(self._decode_element, radar_coords=radar_coords)
 
-        if parallel:
-            with Pool(processes=min(cpu_count() - 1, 8)) as pool:
+        if mode == "process":
+            with Pool(processes=workers) as pool:
                 results = list(
                     tqdm(
                         pool.imap(decode_func, splitted_data),
@@ -75,6 +435,16 @@ class Decoder:
                         unit="Msg",
                     )
                 )
+        elif mode == "thread":
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(
+                    tqdm(
+                        executor.map(decode_func, splitted_data),
+                        total=len(splitted_data),
+                        desc="Decoding",
+                        unit="Msg",
+                    )
+                )
         else:
             results = list(
                 tqdm(
@@ -84,65 +454,42 @@ class Decoder:
                     unit="Msg",
                 )
             )
-        decoded_messages.extend([msg for msg in results if msg is not None])
-        if max_messages is not None:
-            results = results[:max_messages]
-        # print(results)
         return results
 
-    def export_to_csv(self, decoded_messages):
-        """Export decoded messages to a flattened CSV file."""
-        if not decoded_messages:
-            print("[WARNING] No hay mensajes CAT21 decodificados para exportar.")
+    def export_to_csv(
+        self, decoded_messages, output_csv="decoded_adsb_data.csv", columns=None
+    ):
+        """Export decoded messages to CSV, streaming row by row.
+
+        ``decoded_messages`` may be a list or any iterator (e.g.
+        :meth:`iter_messages`); rows are written as they are consumed, so
+        memory use does not grow with the input. ``columns`` defaults to
+        ``DEFAULT_CSV_COLUMNS``. Without any message the file still gets
+        the header row, so it can be read back with the expected columns.
+        """
+        if columns is None:
+            columns = DEFAULT_CSV_COLUMNS
+        print("Generando CSV...")
+        with CsvStreamWriter(output_csv, columns) as writer:
+            writer.write_records(decoded_messages)
+        if not writer.rows:
+            print(
+                "[WARNING] No hay mensajes decodificados para exportar; "
+                f"CSV solo con cabecera: {output_csv}"
+            )
             return
+        print(f"[INFO] CSV exportado correctamente: {output_csv} ({writer.rows} filas)")
 
-        print("Aplanando datos y generando CSV...")
-
-        # Lógica de aplanamiento robusta
-        flattened_data = []
-        for message in decoded_messages:
-            flat_record = {}
-            # Include top-level fields
-            for key, value in message.items():
-                if not isinstance(value, dict):
-                    flat_record[key] = value
-                else:
-                    # Include nested dictionary fields
-                    flat_record.update(value)
-            flattened_data.append(flat_record)
-
-        df = pd.DataFrame(flattened_data)
-
-        # Lista de columnas exacta que solicitaste
-        cols_to_export = [
-            "Category",
-            "SIC",
-            "ATP Description",
-            "ARC Description",
-            "RC Description",
-            "RAB Description",
-            "Latitude (deg)",
-            "Longitude (deg)",
-            "ICAO Address (hex)",
-            "Time (s since midnight)",
-            "UTC Time (HH:MM:SS)",
-            "Mode-3/A Code",
-            "Flight Level (FL)",
-            "Altitude (ft)",
-            "Target Identification",
-            "Range (m)Theta",
-            "TA",
-            "Barometric Pressure Setting",
-            "GS(kts)",
-            "HDG(deg)IAS",
-            "Mach",
-            "STAT",
-        ]
-
-        # Reordenar y filtrar el DataFrame para que coincida con la lista
-        final_cols = [col for col in cols_to_export if col in df.columns]
-        filtered_df = df[final_cols]
-
-        output_csv = "decoded_adsb_data.csv"
-        filtered_df.to_csv(output_csv, index=False)
-        print(f"[INFO] CSV exportado correctamente: {output_csv}")
+    def export_table(self, decoded_messages, output_path, **kwargs):
+        """Export decoded messages to Parquet, Feather or CSV.
+
+        The format follows the extension of ``output_path``; Parquet and
+        Feather get compact dtypes and compression (see
+        :func:`decoder.export.write_table`, which receives ``kwargs``).
+        """
+        if not decoded_messages:
+            print("[WARNING] No decoded messages to export.")
+            return
+        df = flatten_messages(decoded_messages)
+        write_table(df, output_path, **kwargs)
+        print(f"[INFO] Exported {len(df)} records to {output_path}")
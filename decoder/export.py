@@ -0,0 +1,253 @@
+"""Columnar export of decoded data (Parquet, Feather/Arrow IPC, CSV).
+
+Parquet and Feather files are written with compact dtypes: repeated strings
+become categoricals (dictionary-encoded on disk) and measurements that do not
+need double precision are stored as float32. They are typically several
+times smaller than the CSV export and load back in a fraction of the time,
+so :func:`read_table` can reopen an export in the dashboard without
+re-decoding the capture.
+"""
+
+import csv
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+FEATHER_EXTENSIONS = (".feather", ".arrow", ".ipc")
+TABLE_EXTENSIONS = PARQUET_EXTENSIONS + FEATHER_EXTENSIONS
+CSV_EXTENSIONS = (".csv",)
+
+# Columns kept in float64: positions and timestamps lose meaningful
+# precision in float32 (~1 m in latitude, ~10 ms in time of day).
+FLOAT64_COLUMNS = {
+    "Time (s since midnight)",
+    "Latitude (deg)",
+    "Longitude (deg)",
+    "Capture Time",
+}
+# Strings with at most this share of distinct values become categoricals.
+CATEGORY_RATIO = 0.5
+DEFAULT_ROW_GROUP_SIZE = 128 * 1024
+
+# Columns written by Decoder.export_to_csv unless the caller picks others.
+DEFAULT_CSV_COLUMNS = [
+    "Category",
+    "SIC",
+    "ATP Description",
+    "ARC Description",
+    "RC Description",
+    "RAB Description",
+    "Latitude (deg)",
+    "Longitude (deg)",
+    "ICAO Address (hex)",
+    "Time (s since midnight)",
+    "UTC Time (HH:MM:SS)",
+    "Mode-3/A Code",
+    "Flight Level (FL)",
+    "Altitude (ft)",
+    "Target Identification",
+    "Range (m)",
+    "Theta (deg)",
+    "Aircraft Address",
+    "Barometric Pressure Setting",
+    "Ground Speed (kts)",
+    "Magnetic Heading (deg)",
+    "IAS (kt)",
+    "Mach",
+    "STAT",
+]
+
+
+def flatten_message(message):
+    """Flatten one decoded message dict, lifting nested dicts one level."""
+    flat_record = {}
+    for key, value in message.items():
+        if not isinstance(value, dict):
+            flat_record[key] = value
+        else:
+            flat_record.update(value)
+    return flat_record
+
+
+def flatten_messages(decoded_messages):
+    """Flatten decoded message dicts (one nesting level) into a DataFrame."""
+    return pd.DataFrame(
+        [flatten_message(message) for message in decoded_messages if message]
+    )
+
+
+class CsvStreamWriter:
+    """Incremental CSV writer with a fixed column schema.
+
+    Rows are written as they arrive, so memory stays constant however many
+    records pass through. Missing fields are left empty and fields outside
+    ``columns`` are ignored. When ``columns`` is ``None`` the schema is taken
+    from the first record.
+
+    Example:
+
+        with CsvStreamWriter("out.csv", columns) as writer:
+            writer.write_records(decoder.iter_messages("capture.ast"))
+    """
+
+    def __init__(self, path, columns=None):
+        self.path = path
+        self.columns = list(columns) if columns is not None else None
+        self.rows = 0
+        self._file = None
+        self._writer = None
+
+    def _open(self, columns):
+        self.columns = list(columns)
+        self._file = open(self.path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(
+            self._file, fieldnames=self.columns, extrasaction="ignore"
+        )
+        self._writer.writeheader()
+
+    def write_records(self, records):
+        """Write decoded message dicts (``None`` entries are skipped)."""
+        for message in records:
+            if not message:
+                continue
+            row = flatten_message(message)
+            if self._writer is None:
+                self._open(self.columns if self.columns is not None else row)
+            self._writer.writerow(row)
+            self.rows += 1
+
+    def write_batch(self, batch):
+        """Write a batch: a DataFrame, a dict of columns or a list of dicts."""
+        if isinstance(batch, dict):
+            batch = pd.DataFrame(batch)
+        if not isinstance(batch, pd.DataFrame):
+            self.write_records(batch)
+            return
+        if self._writer is None:
+            self._open(self.columns if self.columns is not None else batch.columns)
+        batch.reindex(columns=self.columns).to_csv(
+            self._file, header=False, index=False
+        )
+        self.rows += len(batch)
+
+    def close(self):
+        if self._file is None and self.columns is not None:
+            # No rows: still produce a file with the header.
+            self._open(self.columns)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def table_format(path):
+    """Return "parquet", "feather" or "csv" from the file extension.
+
+    Raises:
+        ValueError: The extension is none of the supported ones.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix in PARQUET_EXTENSIONS:
+        return "parquet"
+    if suffix in FEATHER_EXTENSIONS:
+        return "feather"
+    if suffix in CSV_EXTENSIONS:
+        return "csv"
+    supported = ", ".join(CSV_EXTENSIONS + TABLE_EXTENSIONS)
+    raise ValueError(
+        f"Unsupported table extension {suffix or '(none)'!r} for {path}; "
+        f"use one of {supported}"
+    )
+
+
+def optimize_dtypes(df):
+    """Return a copy of ``df`` with compact dtypes for columnar storage."""
+    df = df.copy()
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_float_dtype(series) and col not in FLOAT64_COLUMNS:
+            df[col] = series.astype(np.float32)
+        elif pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast="integer")
+        elif series.dtype == object:
+            values = series.dropna()
+            if values.empty:
+                continue
+            if values.map(type).eq(bool).all():
+                df[col] = series.astype("boolean")
+            elif (
+                values.map(type).eq(str).all()
+                and values.nunique() <= CATEGORY_RATIO * len(values)
+            ):
+                df[col] = series.astype("category")
+    return df
+
+
+def restore_dtypes(df):
+    """Undo :func:`optimize_dtypes`, back to the dtypes the decoders produce."""
+    df = df.copy()
+    for col in df.columns:
+        dtype = df[col].dtype
+        if isinstance(dtype, (pd.CategoricalDtype, pd.StringDtype, pd.BooleanDtype)):
+            df[col] = df[col].astype(object).where(df[col].notna(), None)
+        elif pd.api.types.is_float_dtype(dtype):
+            df[col] = df[col].astype(np.float64)
+        elif pd.api.types.is_integer_dtype(dtype):
+            df[col] = df[col].astype(np.int64)
+    return df
+
+
+def write_table(
+    df,
+    path,
+    compression="zstd",
+    row_group_size=DEFAULT_ROW_GROUP_SIZE,
+    optimize=True,
+):
+    """Write ``df`` to ``path`` in the format implied by its extension.
+
+    Args:
+        df: DataFrame to export.
+        path: Destination; ``.csv``, ``.parquet``/``.pq`` or
+            ``.feather``/``.arrow``/``.ipc``. Other extensions raise
+            ``ValueError``.
+        compression: Codec for Parquet/Feather ("zstd", "lz4", "snappy"...).
+        row_group_size: Rows per Parquet row group / Feather record batch;
+            bounds the memory needed to read the file back in chunks.
+        optimize: Apply :func:`optimize_dtypes` first.
+    """
+    fmt = table_format(path)
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+        return
+    if optimize:
+        df = optimize_dtypes(df)
+    df = df.reset_index(drop=True)
+    if fmt == "parquet":
+        df.to_parquet(
+            path, index=False, compression=compression, row_group_size=row_group_size
+        )
+    else:
+        df.to_feather(path, compression=compression, chunksize=row_group_size)
+
+
+def read_table(path, columns=None, restore=False):
+    """Read a table written by :func:`write_table` (or any ``.csv`` file).
+
+    ``restore`` converts the compact dtypes back with :func:`restore_dtypes`.
+    """
+    fmt = table_format(path)
+    if fmt == "parquet":
+        df = pd.read_parquet(path, columns=columns)
+    elif fmt == "feather":
+        df = pd.read_feather(path, columns=columns)
+    else:
+        df = pd.read_csv(path, usecols=columns)
+    return restore_dtypes(df) if restore else df
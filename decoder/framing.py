@@ -0,0 +1,62 @@
+"""Byte-level ASTERIX data block framing.
+
+A data block is ``CAT (1 octet) | LEN (2 octets, big endian) | body`` where
+LEN counts the whole block, header included. The helpers here walk any
+buffer-protocol object (``bytes``, ``bytearray``, ``memoryview``, ``mmap``)
+through a memoryview, so framing never copies the input.
+"""
+
+HEADER_LEN = 3
+
+
+def iter_blocks(buffer, max_blocks=None):
+    """Yield ``(cat, length, body)`` for each complete block in ``buffer``.
+
+    ``body`` is a zero-copy memoryview slice over the block payload (after
+    the 3-octet header). Iteration stops at the first truncated or malformed
+    block (LEN < 3), mirroring the Rust framer.
+    """
+    view = memoryview(buffer).cast("B")
+    total = len(view)
+    pos = 0
+    count = 0
+    while pos + HEADER_LEN <= total:
+        if max_blocks is not None and count >= max_blocks:
+            break
+        cat = view[pos]
+        length = (view[pos + 1] << 8) | view[pos + 2]
+        end = pos + length
+        if length < HEADER_LEN or end > total:
+            break
+        yield cat, length, view[pos + HEADER_LEN : end]
+        pos = end
+        count += 1
+
+
+def iter_stream_blocks(stream, max_blocks=None, chunk_size=1 << 20):
+    """Like :func:`iter_blocks`, but read ``stream`` in ``chunk_size`` pieces.
+
+    ``stream`` is any binary file object (e.g. a decompressing reader). Only
+    one chunk plus the tail of a block straddling two chunks is held at once;
+    the yielded ``body`` views keep their own chunk alive.
+    """
+    pending = b""
+    count = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        buffer = pending + chunk if pending else chunk
+        total = len(buffer)
+        pos = 0
+        for cat, length, body in iter_blocks(buffer):
+            if max_blocks is not None and count >= max_blocks:
+                return
+            yield cat, length, body
+            pos += length
+            count += 1
+        if pos + HEADER_LEN <= total:
+            length = (buffer[pos + 1] << 8) | buffer[pos + 2]
+            if length < HEADER_LEN:
+                return
+        pending = buffer[pos:]
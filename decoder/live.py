@@ -0,0 +1,237 @@
+"""Live ASTERIX ingestion over UDP (unicast or multicast).
+
+Datagrams are framed in place with :func:`decoder.framing.iter_blocks`,
+decoded with the regular CAT48/CAT21 decoders and published into a bounded
+:class:`RingBuffer`. Consumers either poll :meth:`RingBuffer.snapshot` or
+``async for`` over a subscription; slow subscribers lose their oldest records
+instead of making memory grow.
+
+Run a receiver from the command line with:
+
+    python -m decoder.live --port 8600 --group 239.0.0.1
+"""
+
+import argparse
+import asyncio
+import socket
+import struct
+from collections import deque
+from time import perf_counter
+
+import numpy as np
+from rich import print
+
+from .decoder import Decoder
+from .framing import iter_blocks
+from .geoutils import CoordinatesWGS84
+
+
+class Subscription:
+    """Bounded per-consumer queue fed by a :class:`RingBuffer`.
+
+    When the consumer falls behind, the oldest pending record is dropped and
+    counted in ``dropped``.
+    """
+
+    def __init__(self, ring, maxsize):
+        self._ring = ring
+        self._queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def _put(self, record):
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(record)
+
+    async def get(self):
+        """Wait for the next record."""
+        return await self._queue.get()
+
+    def close(self):
+        """Stop receiving records."""
+        self._ring.unsubscribe(self)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self._queue.get()
+
+
+class RingBuffer:
+    """Fixed-capacity store of the most recent decoded records."""
+
+    def __init__(self, capacity=100_000):
+        self._records = deque(maxlen=capacity)
+        self._subscribers = set()
+        self.total = 0
+
+    def __len__(self):
+        return len(self._records)
+
+    def publish(self, record):
+        """Append a record and fan it out to every subscriber."""
+        self._records.append(record)
+        self.total += 1
+        for subscriber in self._subscribers:
+            subscriber._put(record)
+
+    def snapshot(self):
+        """Return a list copy of the buffered records, oldest first."""
+        return list(self._records)
+
+    def subscribe(self, maxsize=10_000):
+        """Register a consumer; must be called from the event loop thread."""
+        subscription = Subscription(self, maxsize)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self._subscribers.discard(subscription)
+
+
+class _AsterixProtocol(asyncio.DatagramProtocol):
+    """Decode each datagram synchronously and hand records to the receiver."""
+
+    def __init__(self, receiver):
+        self.receiver = receiver
+
+    def datagram_received(self, data, addr):
+        self.receiver.handle_datagram(data)
+
+    def error_received(self, exc):
+        self.receiver.stats["errors"] += 1
+
+
+class LiveReceiver:
+    """Asyncio UDP receiver feeding a :class:`RingBuffer`.
+
+    Args:
+        radar_coords: Radar position used to georeference CAT48 plots.
+        capacity: Number of records kept in ``self.buffer``.
+        decoder: Optional :class:`Decoder` to reuse (and its GeoUtils cache).
+    """
+
+    def __init__(self, radar_coords=None, capacity=100_000, decoder=None):
+        self.radar_coords = radar_coords
+        self.decoder = decoder if decoder is not None else Decoder()
+        self.buffer = RingBuffer(capacity)
+        self.transport = None
+        self.stats = {
+            "datagrams": 0,
+            "blocks": 0,
+            "records": 0,
+            "errors": 0,
+            "max_latency": 0.0,
+        }
+
+    def handle_datagram(self, data):
+        """Frame, decode and publish every ASTERIX block in ``data``."""
+        start = perf_counter()
+        stats = self.stats
+        stats["datagrams"] += 1
+        for cat, length, body in iter_blocks(data):
+            stats["blocks"] += 1
+            if cat not in (21, 48):
+                continue
+            try:
+                record = self.decoder.decode_block(
+                    cat, length, body, radar_coords=self.radar_coords
+                )
+            except Exception:
+                stats["errors"] += 1
+                continue
+            if record is not None:
+                stats["records"] += 1
+                self.buffer.publish(record)
+        stats["max_latency"] = max(stats["max_latency"], perf_counter() - start)
+
+    async def start(self, port, host="0.0.0.0", group=None, interface="0.0.0.0"):
+        """Bind the UDP socket and start receiving.
+
+        ``group`` joins an IPv4 multicast group on ``interface``; without it
+        the socket receives unicast datagrams sent to ``host:port``.
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+        if group is not None:
+            # Binding to the group address filters out other groups on the
+            # same port (Linux); Windows only accepts the wildcard.
+            try:
+                sock.bind((group, port))
+            except OSError:
+                sock.bind(("", port))
+            mreq = struct.pack(
+                "4s4s", socket.inet_aton(group), socket.inet_aton(interface)
+            )
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
+        else:
+            sock.bind((host, port))
+        sock.setblocking(False)
+
+        loop = asyncio.get_running_loop()
+        self.transport, _ = await loop.create_datagram_endpoint(
+            lambda: _AsterixProtocol(self), sock=sock
+        )
+        return self
+
+    def close(self):
+        """Close the socket; buffered records stay available."""
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+
+def parse_args():
+    """Create CLI parser for the live receiver."""
+    parser = argparse.ArgumentParser(description="Receive ASTERIX over UDP")
+    parser.add_argument("--port", type=int, default=8600, help="UDP port")
+    parser.add_argument("--host", default="0.0.0.0", help="Unicast bind address")
+    parser.add_argument("--group", default=None, help="Multicast group to join")
+    parser.add_argument(
+        "--interface", default="0.0.0.0", help="Interface address for multicast"
+    )
+    parser.add_argument(
+        "--capacity", type=int, default=100_000, help="Ring buffer size (records)"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=1.0, help="Seconds between status lines"
+    )
+    return parser.parse_args()
+
+
+async def _run(args, coords_radar):
+    receiver = LiveReceiver(coords_radar, capacity=args.capacity)
+    await receiver.start(args.port, args.host, args.group, args.interface)
+    print(f"Listening on {args.group or args.host}:{args.port}")
+    try:
+        while True:
+            await asyncio.sleep(args.interval)
+            stats = receiver.stats
+            print(
+                f"{stats['datagrams']} datagrams, {stats['records']} records, "
+                f"{stats['errors']} errors, buffered {len(receiver.buffer)}, "
+                f"max latency {stats['max_latency'] * 1e3:.3f} ms"
+            )
+    finally:
+        receiver.close()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    radar_lat = (41 + 18 / 60.0 + 2.5184 / 3600.0) * np.pi / 180
+    radar_lon = (2 + 6 / 60.0 + 7.4095 / 3600.0) * np.pi / 180
+    radar_alt = 27.25
+    coords_radar = CoordinatesWGS84(radar_lat, radar_lon, radar_alt)
+    try:
+        asyncio.run(_run(args, coords_radar))
+    except KeyboardInterrupt:
+        pass
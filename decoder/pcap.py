@@ -0,0 +1,243 @@
+"""Streaming pcap/pcapng reader for network captures of ASTERIX over UDP.
+
+The capture is memory-mapped and walked record by record; link, IP and UDP
+headers are parsed in place and the UDP payloads are yielded as memoryview
+slices of the mapping, so multi-GB captures are never read into memory or
+converted to ``.ast`` first.
+
+Supported link types are Ethernet (with 802.1Q tags), BSD loopback, raw IP
+and Linux cooked captures (SLL and SLL2), carrying IPv4 or IPv6. IP fragments
+are skipped: ASTERIX datagrams fit in a single frame in practice.
+"""
+
+import socket
+import struct
+
+from .framing import iter_blocks
+
+PCAP_MAGIC_US = 0xA1B2C3D4
+PCAP_MAGIC_NS = 0xA1B23C4D
+PCAPNG_SHB = 0x0A0D0D0A
+PCAPNG_BYTE_ORDER_MAGIC = 0x1A2B3C4D
+PCAPNG_IDB = 1
+PCAPNG_SPB = 3
+PCAPNG_EPB = 6
+
+LINKTYPE_NULL = 0
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = 101
+LINKTYPE_LINUX_SLL = 113
+LINKTYPE_IPV4 = 228
+LINKTYPE_IPV6 = 229
+LINKTYPE_LINUX_SLL2 = 276
+
+ETHERTYPE_IPV4 = 0x0800
+ETHERTYPE_IPV6 = 0x86DD
+ETHERTYPE_VLAN = (0x8100, 0x88A8)
+IPPROTO_UDP = 17
+
+
+def _iter_pcap(view):
+    """Yield ``(timestamp, linktype, frame)`` from a classic pcap file."""
+    magic = struct.unpack_from("<I", view, 0)[0]
+    if magic in (PCAP_MAGIC_US, PCAP_MAGIC_NS):
+        endian = "<"
+    else:
+        endian = ">"
+        magic = struct.unpack_from(">I", view, 0)[0]
+        if magic not in (PCAP_MAGIC_US, PCAP_MAGIC_NS):
+            raise ValueError("not a pcap/pcapng file")
+    scale = 1e-9 if magic == PCAP_MAGIC_NS else 1e-6
+    linktype = struct.unpack_from(endian + "I", view, 20)[0] & 0x0FFFFFFF
+    record = struct.Struct(endian + "IIII")
+
+    pos = 24
+    total = len(view)
+    while pos + record.size <= total:
+        seconds, fraction, caplen, _ = record.unpack_from(view, pos)
+        pos += record.size
+        if pos + caplen > total:
+            break
+        yield seconds + fraction * scale, linktype, view[pos : pos + caplen]
+        pos += caplen
+
+
+def _tsresol(options, endian):
+    """Timestamp resolution (seconds per unit) from IDB options."""
+    pos = 0
+    while pos + 4 <= len(options):
+        code, length = struct.unpack_from(endian + "HH", options, pos)
+        if code == 0:
+            break
+        if code == 9 and length >= 1:
+            value = options[pos + 4]
+            if value & 0x80:
+                return 2.0 ** -(value & 0x7F)
+            return 10.0 ** -value
+        pos += 4 + ((length + 3) & ~3)
+    return 1e-6
+
+
+def _iter_pcapng(view):
+    """Yield ``(timestamp, linktype, frame)`` from a pcapng file.
+
+    Simple packet blocks carry no timestamp and yield ``None``.
+    """
+    total = len(view)
+    pos = 0
+    endian = "<"
+    interfaces = []
+    while pos + 12 <= total:
+        block_type = struct.unpack_from(endian + "I", view, pos)[0]
+        if block_type == PCAPNG_SHB:
+            # Each section may switch byte order and resets the interfaces.
+            bom = struct.unpack_from("<I", view, pos + 8)[0]
+            endian = "<" if bom == PCAPNG_BYTE_ORDER_MAGIC else ">"
+            interfaces = []
+        length = struct.unpack_from(endian + "I", view, pos + 4)[0]
+        if length < 12 or pos + length > total:
+            break
+        body = view[pos + 8 : pos + length - 4]
+
+        if block_type == PCAPNG_IDB:
+            linktype = struct.unpack_from(endian + "H", body, 0)[0]
+            interfaces.append((linktype, _tsresol(body[8:], endian)))
+        elif block_type == PCAPNG_EPB:
+            iface, high, low, caplen = struct.unpack_from(endian + "IIII", body, 0)
+            if iface < len(interfaces):
+                linktype, resolution = interfaces[iface]
+                yield (
+                    ((high << 32) | low) * resolution,
+                    linktype,
+                    body[20 : 20 + caplen],
+                )
+        elif block_type == PCAPNG_SPB and interfaces:
+            origlen = struct.unpack_from(endian + "I", body, 0)[0]
+            yield None, interfaces[0][0], body[4 : 4 + origlen]
+        pos += length
+
+
+def iter_frames(buffer):
+    """Yield ``(timestamp, linktype, frame)`` for every captured packet.
+
+    The format (pcap or pcapng, either byte order) is detected from the magic
+    number; anything else raises ``ValueError``. Timestamps are POSIX seconds
+    as floats.
+    """
+    # Released explicitly so that an error leaves no export on the buffer
+    # (an mmap cannot be closed while one exists).
+    with memoryview(buffer) as raw, raw.cast("B") as view:
+        if not len(view):
+            return
+        if len(view) < 24:
+            raise ValueError("not a pcap/pcapng file")
+        if struct.unpack_from("<I", view, 0)[0] == PCAPNG_SHB:
+            yield from _iter_pcapng(view)
+        else:
+            yield from _iter_pcap(view)
+
+
+def udp_payload(linktype, frame):
+    """Return ``(dst_ip, dst_port, payload)`` for a UDP frame, else ``None``.
+
+    ``dst_ip`` is the packed address (4 or 16 bytes) and ``payload`` a
+    memoryview slice of ``frame``.
+    """
+    if linktype == LINKTYPE_ETHERNET:
+        offset = 14
+        if len(frame) < offset:
+            return None
+        ethertype = (frame[12] << 8) | frame[13]
+        while ethertype in ETHERTYPE_VLAN and len(frame) >= offset + 4:
+            ethertype = (frame[offset + 2] << 8) | frame[offset + 3]
+            offset += 4
+    elif linktype == LINKTYPE_LINUX_SLL:
+        offset = 16
+        if len(frame) < offset:
+            return None
+        ethertype = (frame[14] << 8) | frame[15]
+    elif linktype == LINKTYPE_LINUX_SLL2:
+        offset = 20
+        if len(frame) < offset:
+            return None
+        ethertype = (frame[0] << 8) | frame[1]
+    elif linktype == LINKTYPE_NULL:
+        offset = 4
+        if len(frame) < offset:
+            return None
+        family = frame[0] or frame[3]
+        ethertype = ETHERTYPE_IPV4 if family == 2 else ETHERTYPE_IPV6
+    elif linktype in (LINKTYPE_RAW, LINKTYPE_IPV4, LINKTYPE_IPV6):
+        offset = 0
+        if not len(frame):
+            return None
+        ethertype = ETHERTYPE_IPV4 if frame[0] >> 4 == 4 else ETHERTYPE_IPV6
+    else:
+        return None
+
+    if ethertype == ETHERTYPE_IPV4:
+        if len(frame) < offset + 20:
+            return None
+        header_len = (frame[offset] & 0x0F) * 4
+        flags_fragment = (frame[offset + 6] << 8) | frame[offset + 7]
+        if frame[offset + 9] != IPPROTO_UDP or flags_fragment & 0x3FFF:
+            return None
+        dst_ip = bytes(frame[offset + 16 : offset + 20])
+        offset += header_len
+    elif ethertype == ETHERTYPE_IPV6:
+        if len(frame) < offset + 40 or frame[offset + 6] != IPPROTO_UDP:
+            return None
+        dst_ip = bytes(frame[offset + 24 : offset + 40])
+        offset += 40
+    else:
+        return None
+
+    if len(frame) < offset + 8:
+        return None
+    dst_port = (frame[offset + 2] << 8) | frame[offset + 3]
+    udp_len = (frame[offset + 4] << 8) | frame[offset + 5]
+    end = min(len(frame), offset + udp_len) if udp_len >= 8 else len(frame)
+    return dst_ip, dst_port, frame[offset + 8 : end]
+
+
+def _pack_address(address):
+    family = socket.AF_INET6 if ":" in address else socket.AF_INET
+    return socket.inet_pton(family, address)
+
+
+def iter_udp_payloads(buffer, ports=None, groups=None):
+    """Yield ``(timestamp, payload)`` for the UDP datagrams of a capture.
+
+    Args:
+        buffer: pcap/pcapng contents, typically an ``mmap`` of the file.
+        ports: Optional iterable of destination ports to keep.
+        groups: Optional iterable of destination addresses (multicast groups
+            or unicast hosts) to keep, as strings.
+    """
+    ports = set(ports) if ports else None
+    groups = {_pack_address(group) for group in groups} if groups else None
+    for timestamp, linktype, frame in iter_frames(buffer):
+        udp = udp_payload(linktype, frame)
+        if udp is None:
+            continue
+        dst_ip, dst_port, payload = udp
+        if ports is not None and dst_port not in ports:
+            continue
+        if groups is not None and dst_ip not in groups:
+            continue
+        yield timestamp, payload
+
+
+def iter_pcap_blocks(buffer, ports=None, groups=None, max_blocks=None):
+    """Yield ``(timestamp, cat, length, body)`` for each ASTERIX block.
+
+    ``body`` is a memoryview slice of ``buffer``; ``timestamp`` is the capture
+    time of the datagram the block arrived in.
+    """
+    count = 0
+    for timestamp, payload in iter_udp_payloads(buffer, ports, groups):
+        for cat, length, body in iter_blocks(payload):
+            if max_blocks is not None and count >= max_blocks:
+                return
+            yield timestamp, cat, length, body
+            count += 1
@@ -0,0 +1,260 @@
+"""Compact column-oriented storage for decoded messages.
+
+A decoded message is a dict with dozens of long string keys and many
+repeated descriptive strings ("Single SSR detection", ...), which costs
+around a kilobyte per message. :class:`RecordTable` keeps the same data as
+one typed NumPy array per field instead:
+
+* floats are ``float64`` with NaN for missing values,
+* integers are ``int64`` with ``INT_MISSING`` as the missing marker,
+* booleans are ``int8`` (0/1, -1 when missing),
+* strings are ``int32`` codes into a per-field lookup table (-1 when
+  missing), the same convention as ``pandas.Categorical``.
+
+Tables built from successive batches of messages are joined with
+:meth:`RecordTable.concat`, so a large decode never has to hold all of its
+message dicts at once.
+
+Rows are still available as dicts through indexing and iteration, so a table
+can stand in for the list returned by ``Decoder.load`` (e.g. in
+``Decoder.export_to_csv``), and :meth:`RecordTable.to_dataframe` builds a
+DataFrame with categorical columns without going through Python objects.
+"""
+
+import numpy as np
+import pandas as pd
+
+INT_MISSING = np.iinfo(np.int64).min
+
+FLOAT = "float"
+INT = "int"
+BOOL = "bool"
+TEXT = "text"
+OBJECT = "object"
+
+
+def _items(message):
+    """Yield a message's fields, lifting nested dicts one level (like CSV)."""
+    for key, value in message.items():
+        if isinstance(value, dict):
+            yield from value.items()
+        else:
+            yield key, value
+
+
+def _kind(value):
+    # bool is a subclass of int, so it must be tested first.
+    if isinstance(value, (bool, np.bool_)):
+        return BOOL
+    if isinstance(value, (int, np.integer)):
+        return INT
+    if isinstance(value, (float, np.floating)):
+        return FLOAT
+    if isinstance(value, str):
+        return TEXT
+    return OBJECT
+
+
+def _merge_kinds(old, new):
+    if old is None or old == new:
+        return new
+    if {old, new} == {INT, FLOAT}:
+        return FLOAT
+    return OBJECT
+
+
+def _missing_column(kind, length):
+    """Column of ``length`` missing values of ``kind``."""
+    if kind == FLOAT:
+        return np.full(length, np.nan)
+    if kind == INT:
+        return np.full(length, INT_MISSING, dtype=np.int64)
+    if kind == BOOL:
+        return np.full(length, -1, dtype=np.int8)
+    if kind == TEXT:
+        return np.full(length, -1, dtype=np.int32)
+    return np.full(length, None, dtype=object)
+
+
+class RecordTable:
+    """Decoded messages stored column by column with categorical codes."""
+
+    __slots__ = ("columns", "kinds", "categories", "_length")
+
+    def __init__(self, columns, kinds, categories, length):
+        self.columns = columns
+        self.kinds = kinds
+        self.categories = categories
+        self._length = length
+
+    @classmethod
+    def from_messages(cls, messages):
+        """Build a table from decoded message dicts (``None`` is skipped).
+
+        Nested dicts are flattened one level, like the CSV export.
+        """
+        messages = [m for m in messages if m]
+
+        kinds = {}
+        for message in messages:
+            for key, value in _items(message):
+                if value is not None:
+                    kinds[key] = _merge_kinds(kinds.get(key), _kind(value))
+
+        length = len(messages)
+        columns = {key: _missing_column(kind, length) for key, kind in kinds.items()}
+        categories = {key: {} for key, kind in kinds.items() if kind == TEXT}
+
+        for i, message in enumerate(messages):
+            for key, value in _items(message):
+                if value is None:
+                    continue
+                if key in categories:
+                    lookup = categories[key]
+                    code = lookup.get(value)
+                    if code is None:
+                        code = lookup[value] = len(lookup)
+                    columns[key][i] = code
+                else:
+                    columns[key][i] = value
+
+        categories = {key: list(lookup) for key, lookup in categories.items()}
+        return cls(columns, kinds, categories, length)
+
+    @classmethod
+    def from_batches(cls, batches):
+        """Build a table from an iterable of message lists, one at a time.
+
+        Only the current batch is held as dicts; the result is the same as
+        :meth:`from_messages` over all the messages.
+        """
+        return cls.concat([cls.from_messages(messages) for messages in batches])
+
+    @classmethod
+    def concat(cls, tables):
+        """Join tables row-wise, merging kinds and string lookups."""
+        tables = list(tables)
+        kinds = {}
+        for table in tables:
+            for key, kind in table.kinds.items():
+                kinds[key] = _merge_kinds(kinds.get(key), kind)
+
+        columns = {}
+        categories = {}
+        for key, kind in kinds.items():
+            if kind == TEXT:
+                lookup = {}
+                parts = []
+                for table in tables:
+                    if key not in table.columns:
+                        parts.append(_missing_column(TEXT, len(table)))
+                        continue
+                    # Old code -> new code, with -1 (missing) kept as -1.
+                    remap = [
+                        lookup.setdefault(value, len(lookup))
+                        for value in table.categories[key]
+                    ]
+                    remap = np.array(remap + [-1], dtype=np.int32)
+                    parts.append(remap[table.columns[key]])
+                categories[key] = list(lookup)
+            else:
+                parts = [table._column_as(key, kind) for table in tables]
+            columns[key] = np.concatenate(parts) if parts else _missing_column(kind, 0)
+        return cls(columns, kinds, categories, sum(len(table) for table in tables))
+
+    def _column_as(self, key, kind):
+        """Column ``key`` converted to ``kind`` (a kind merged with its own)."""
+        if key not in self.columns:
+            return _missing_column(kind, self._length)
+        column = self.columns[key]
+        own = self.kinds[key]
+        if own == kind:
+            return column
+        if kind == FLOAT:
+            # Only ints widen to float.
+            return np.where(column == INT_MISSING, np.nan, column.astype(float))
+        # Any other mix becomes OBJECT: the present values as Python objects.
+        if own == FLOAT:
+            present = ~np.isnan(column)
+            present_values = column[present].tolist()
+        elif own == INT:
+            present = column != INT_MISSING
+            present_values = column[present].tolist()
+        elif own == BOOL:
+            present = column >= 0
+            present_values = (column[present] > 0).tolist()
+        else:
+            present = column >= 0
+            lookup = np.array(self.categories[key], dtype=object)
+            present_values = lookup[column[present]].tolist()
+        values = np.full(self._length, None, dtype=object)
+        values[present] = present_values
+        return values
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        """Return row ``index`` as a dict holding only the present fields."""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("RecordTable index out of range")
+        row = {}
+        for key, column in self.columns.items():
+            value = column[index]
+            kind = self.kinds[key]
+            if kind == FLOAT:
+                if value == value:
+                    row[key] = float(value)
+            elif kind == INT:
+                if value != INT_MISSING:
+                    row[key] = int(value)
+            elif kind == BOOL:
+                if value >= 0:
+                    row[key] = bool(value)
+            elif kind == TEXT:
+                if value >= 0:
+                    row[key] = self.categories[key][value]
+            elif value is not None:
+                row[key] = value
+        return row
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield self[index]
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the arrays and lookup tables."""
+        total = sum(column.nbytes for column in self.columns.values())
+        total += sum(
+            sum(len(value) for value in values) for values in self.categories.values()
+        )
+        return total
+
+    def codes(self, key):
+        """Integer codes of a text field; decode with ``categories[key]``."""
+        return self.columns[key]
+
+    def to_dataframe(self, categorical=True):
+        """Build a DataFrame; text fields become categoricals by default."""
+        data = {}
+        for key, column in self.columns.items():
+            kind = self.kinds[key]
+            if kind == INT:
+                missing = column == INT_MISSING
+                if missing.any():
+                    column = pd.arrays.IntegerArray(column, missing)
+            elif kind == BOOL:
+                missing = column < 0
+                if missing.any():
+                    column = pd.arrays.BooleanArray(column > 0, missing)
+                else:
+                    column = column.astype(bool)
+            elif kind == TEXT:
+                column = pd.Categorical.from_codes(column, self.categories[key])
+                if not categorical:
+                    column = np.asarray(column, dtype=object)
+            data[key] = column
+        return pd.DataFrame(data, index=pd.RangeIndex(self._length))
@@ -0,0 +1,171 @@
+"""Replay an ASTERIX capture over UDP at its recorded pace.
+
+Blocks are scheduled from the decoded "Time (s since midnight)" of each
+record and sent at the original rate, ``speed`` times faster, or as fast as
+possible (``speed=0``). Consecutive blocks due at the same instant are packed
+into one datagram, like a radar head does. Pair it with ``decoder.live`` for
+a reproducible local traffic source:
+
+    python -m decoder.replay Test_Data/datos_asterix_combinado.ast --speed 10
+"""
+
+import argparse
+import mmap
+import socket
+from time import perf_counter, sleep
+
+from rich import print
+
+from .decoder import Decoder
+from .framing import iter_blocks
+
+SECONDS_PER_DAY = 86400
+# Below this distance to the deadline the timer spins instead of sleeping,
+# since time.sleep can overshoot by a scheduler tick.
+SPIN_THRESHOLD = 0.002
+
+
+def build_schedule(buffer, max_messages=None, max_datagram=1400):
+    """Group the blocks of ``buffer`` into timed datagrams.
+
+    Returns a list of ``(offset, start, end)`` tuples: seconds since the first
+    record, and the byte range of the datagram in ``buffer``. Blocks without a
+    decodable time inherit the previous one, times are kept monotonic and a
+    midnight rollover is unwrapped.
+
+    Blocks are decoded one at a time as the buffer is framed, without
+    georeferencing, and only their time is kept.
+    """
+    decoder = Decoder()
+    schedule = []
+    first = None
+    current = 0.0
+    start = 0
+    for cat, length, body in iter_blocks(buffer, max_messages):
+        end = start + length
+        try:
+            record = decoder.decode_block(cat, length, body)
+        except Exception:
+            record = None
+        tod = (record or {}).get("Time (s since midnight)")
+        if tod is not None:
+            if first is None:
+                first = tod
+            offset = tod - first
+            if offset < current - SECONDS_PER_DAY / 2:
+                offset += SECONDS_PER_DAY
+            current = max(current, offset)
+        if (
+            schedule
+            and schedule[-1][0] == current
+            and schedule[-1][2] == start
+            and end - schedule[-1][1] <= max_datagram
+        ):
+            schedule[-1] = (current, schedule[-1][1], end)
+        else:
+            schedule.append((current, start, end))
+        start = end
+    return schedule
+
+
+def replay(buffer, schedule, address, speed=1.0, ttl=1):
+    """Send the datagrams of ``schedule`` to ``address`` and return statistics.
+
+    ``speed`` scales the recorded pace (2.0 is twice as fast); ``0`` disables
+    pacing altogether.
+    """
+    view = memoryview(buffer)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+    sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+
+    datagrams = 0
+    sent_bytes = 0
+    max_late = 0.0
+    total_late = 0.0
+    start_time = perf_counter()
+    try:
+        for offset, start, end in schedule:
+            if speed > 0:
+                deadline = start_time + offset / speed
+                remaining = deadline - perf_counter()
+                if remaining > SPIN_THRESHOLD:
+                    sleep(remaining - SPIN_THRESHOLD)
+                while perf_counter() < deadline:
+                    pass
+                late = perf_counter() - deadline
+                max_late = max(max_late, late)
+                total_late += late
+            sock.sendto(view[start:end], address)
+            datagrams += 1
+            sent_bytes += end - start
+    finally:
+        sock.close()
+        view.release()
+
+    elapsed = perf_counter() - start_time
+    span = schedule[-1][0] if schedule else 0.0
+    target = span / speed if speed > 0 and span > 0 else None
+    return {
+        "datagrams": datagrams,
+        "bytes": sent_bytes,
+        "elapsed": elapsed,
+        "target_elapsed": target,
+        "rate": datagrams / elapsed if elapsed > 0 else float("inf"),
+        "target_rate": datagrams / target if target else None,
+        "max_late": max_late,
+        "mean_late": total_late / datagrams if datagrams and speed > 0 else 0.0,
+    }
+
+
+def parse_args():
+    """Create CLI parser for the replay tool."""
+    parser = argparse.ArgumentParser(description="Replay an ASTERIX capture over UDP")
+    parser.add_argument("file", help="ASTERIX capture to replay")
+    parser.add_argument("--host", default="127.0.0.1", help="Destination address")
+    parser.add_argument("--port", type=int, default=8600, help="Destination port")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Pace multiplier (0 sends as fast as possible)",
+    )
+    parser.add_argument(
+        "--max-messages",
+        type=int,
+        default=None,
+        help="Maximum number of blocks to replay",
+    )
+    parser.add_argument(
+        "--max-datagram", type=int, default=1400, help="Datagram size limit (bytes)"
+    )
+    parser.add_argument("--ttl", type=int, default=1, help="Multicast TTL")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    with open(args.file, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        schedule = build_schedule(
+            mapped, max_messages=args.max_messages, max_datagram=args.max_datagram
+        )
+        print(
+            f"Replaying {len(schedule)} datagrams spanning "
+            f"{schedule[-1][0] if schedule else 0:.1f} s to {args.host}:{args.port}"
+        )
+        stats = replay(mapped, schedule, (args.host, args.port), args.speed, args.ttl)
+
+    print(f"Sent {stats['datagrams']} datagrams ({stats['bytes']} bytes)")
+    if stats["target_elapsed"] is not None:
+        print(
+            f"Elapsed {stats['elapsed']:.2f} s (target {stats['target_elapsed']:.2f} s), "
+            f"rate {stats['rate']:,.0f}/s (target {stats['target_rate']:,.0f}/s)"
+        )
+        print(
+            f"Lateness mean {stats['mean_late'] * 1e3:.3f} ms, "
+            f"max {stats['max_late'] * 1e3:.3f} ms"
+        )
+    else:
+        print(f"Elapsed {stats['elapsed']:.2f} s, rate {stats['rate']:,.0f}/s")
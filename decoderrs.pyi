@@ -1,4 +1,9 @@
-from typing import Any, Optional
+from mmap import mmap
+from typing import Any, Iterator, Optional, Union
+
+import numpy as np
+
+Buffer = Union[bytes, bytearray, memoryview, mmap]
 
 def load(
     file_path: str,
@@ -7,4 +12,53 @@ def load(
     radar_alt: float,
     max_messages: Optional[int] = None,
     debug_save_path: Optional[str] = None,
+    parallel: bool = False,
+    num_threads: Optional[int] = None,
+) -> list[dict[str, Any]]: ...
+
+def load_columns(
+    file_path: str,
+    radar_lat: float,
+    radar_lon: float,
+    radar_alt: float,
+    max_messages: Optional[int] = None,
+    parallel: bool = False,
+    num_threads: Optional[int] = None,
+) -> Optional[dict[str, np.ndarray]]: ...
+
+def load_buffer(
+    data: Buffer,
+    radar_lat: float,
+    radar_lon: float,
+    radar_alt: float,
+    max_messages: Optional[int] = None,
+    parallel: bool = False,
+    num_threads: Optional[int] = None,
 ) -> list[dict[str, Any]]: ...
+
+def load_columns_buffer(
+    data: Buffer,
+    radar_lat: float,
+    radar_lon: float,
+    radar_alt: float,
+    max_messages: Optional[int] = None,
+    parallel: bool = False,
+    num_threads: Optional[int] = None,
+) -> dict[str, np.ndarray]: ...
+
+class Reader(Iterator[Union[list[dict[str, Any]], dict[str, np.ndarray]]]):
+    def __init__(
+        self,
+        file_path: str,
+        radar_lat: float,
+        radar_lon: float,
+        radar_alt: float,
+        batch_size: int = 10000,
+        columnar: bool = False,
+        max_messages: Optional[int] = None,
+        parallel: bool = False,
+    ) -> None: ...
+    @property
+    def bytes_read(self) -> int: ...
+    def __iter__(self) -> "Reader": ...
+    def __next__(self) -> Union[list[dict[str, Any]], dict[str, np.ndarray]]: ...
@@ -0,0 +1,202 @@
+use crate::cat21::Cat21;
+use crate::cat48::Cat48;
+use numpy::IntoPyArray;
+use pyo3::prelude::*;
+use pyo3::types::PyDict;
+
+/// Conversion of one accumulated column into a NumPy array.
+///
+/// Numeric columns become `float64`/`int64` arrays (missing values are NaN
+/// for floats), text and boolean columns become `object` arrays holding
+/// `str`/`bool` or `None`, matching what pandas infers from the dict path.
+pub trait IntoColumn: Sized {
+    fn into_column(values: Vec<Option<Self>>, py: Python<'_>) -> PyObject;
+}
+
+impl IntoColumn for f64 {
+    fn into_column(values: Vec<Option<Self>>, py: Python<'_>) -> PyObject {
+        let values: Vec<f64> = values.into_iter().map(|v| v.unwrap_or(f64::NAN)).collect();
+        values.into_pyarray_bound(py).into_any().unbind()
+    }
+}
+
+impl IntoColumn for i64 {
+    fn into_column(values: Vec<Option<Self>>, py: Python<'_>) -> PyObject {
+        let values: Vec<i64> = values.into_iter().map(|v| v.unwrap_or(0)).collect();
+        values.into_pyarray_bound(py).into_any().unbind()
+    }
+}
+
+impl IntoColumn for String {
+    fn into_column(values: Vec<Option<Self>>, py: Python<'_>) -> PyObject {
+        let values: Vec<PyObject> = values.into_iter().map(|v| v.into_py(py)).collect();
+        values.into_pyarray_bound(py).into_any().unbind()
+    }
+}
+
+impl IntoColumn for bool {
+    fn into_column(values: Vec<Option<Self>>, py: Python<'_>) -> PyObject {
+        let values: Vec<PyObject> = values.into_iter().map(|v| v.into_py(py)).collect();
+        values.into_pyarray_bound(py).into_any().unbind()
+    }
+}
+
+/// Declare the flat record (`Row`) and its column-major accumulator (`Columns`).
+///
+/// The column list mirrors `ALL_EXPECTED_COLUMNS` in `dashboard.py`, in order.
+macro_rules! columns {
+    ($($field:ident: $ty:ty => $name:literal,)*) => {
+        /// One decoded record flattened to the dashboard column schema.
+        #[derive(Debug, Default)]
+        pub struct Row {
+            $(pub $field: Option<$ty>,)*
+        }
+
+        /// Column-major storage for decoded records.
+        #[derive(Debug, Default)]
+        pub struct Columns {
+            len: usize,
+            $($field: Vec<Option<$ty>>,)*
+        }
+
+        impl Columns {
+            pub fn with_capacity(capacity: usize) -> Self {
+                Columns {
+                    len: 0,
+                    $($field: Vec::with_capacity(capacity),)*
+                }
+            }
+
+            pub fn push(&mut self, row: Row) {
+                $(self.$field.push(row.$field);)*
+                self.len += 1;
+            }
+
+            pub fn len(&self) -> usize {
+                self.len
+            }
+
+            /// Hand the columns to Python as a `{column name: ndarray}` dict.
+            pub fn into_pydict(self, py: Python<'_>) -> PyResult<Bound<'_, PyDict>> {
+                let dict = PyDict::new_bound(py);
+                $(dict.set_item($name, <$ty as IntoColumn>::into_column(self.$field, py))?;)*
+                Ok(dict)
+            }
+        }
+    };
+}
+
+columns! {
+    category: i64 => "Category",
+    sac: f64 => "SAC",
+    sic: f64 => "SIC",
+    time_of_day: f64 => "Time (s since midnight)",
+    time_string: String => "Time String",
+    latitude: f64 => "Latitude (deg)",
+    longitude: f64 => "Longitude (deg)",
+    height_m: f64 => "Height (m)",
+    height_ft: f64 => "Height (ft)",
+    altitude_m: f64 => "Altitude (m)",
+    altitude_ft: f64 => "Altitude (ft)",
+    range_m: f64 => "Range (m)",
+    range_nm: f64 => "Range (NM)",
+    theta: f64 => "Theta (deg)",
+    mode3a_code: String => "Mode-3/A Code",
+    flight_level: f64 => "Flight Level (FL)",
+    aircraft_address: String => "Aircraft Address",
+    target_identification: String => "Target Identification",
+    barometric_pressure_setting: f64 => "Barometric Pressure Setting",
+    roll_angle: f64 => "Roll Angle",
+    track_angle: f64 => "Track Angle",
+    ground_speed_bds: f64 => "Ground Speed (kts) BDS",
+    track_angle_rate: f64 => "Track Angle Rate",
+    tas: f64 => "TAS",
+    magnetic_heading_bds: f64 => "Magnetic Heading (deg) BDS",
+    ias: f64 => "IAS (kt)",
+    mach: f64 => "Mach",
+    barometric_altitude_rate: f64 => "Barometric Altitude Rate",
+    inertial_vertical_velocity: f64 => "Inertial Vertical Velocity",
+    track_number: f64 => "Track Number",
+    ground_speed: f64 => "Ground Speed (kts)",
+    magnetic_heading: f64 => "Magnetic Heading (deg)",
+    stat: String => "STAT",
+    gbs: bool => "GBS",
+    is_pure: bool => "Is_Pure",
+    is_static: bool => "Is_Static",
+}
+
+impl From<Cat48> for Row {
+    fn from(m: Cat48) -> Self {
+        let mb_data = m.mode_s_mb_data.as_ref();
+        let bds40 = mb_data.and_then(|d| d.bds_4_0.as_ref());
+        let bds50 = mb_data.and_then(|d| d.bds_5_0.as_ref());
+        let bds60 = mb_data.and_then(|d| d.bds_6_0.as_ref());
+        let velocity = m.calc_track_vel_polar.as_ref();
+        Row {
+            category: Some(m.category as i64),
+            sac: m.sac.map(f64::from),
+            sic: m.sic.map(f64::from),
+            time_of_day: m.time_of_day,
+            time_string: m.time_string,
+            latitude: m.latitude,
+            longitude: m.longitude,
+            height_m: m.height_m,
+            height_ft: m.height_ft,
+            altitude_m: m.altitude_m,
+            altitude_ft: m.altitude_ft,
+            range_m: m.range_m,
+            range_nm: m.range_nm,
+            theta: m.theta,
+            mode3a_code: m.mode3a_code,
+            flight_level: m.flight_level,
+            aircraft_address: m.aircraft_address,
+            target_identification: m.target_identification,
+            barometric_pressure_setting: bds40.and_then(|b| b.bar_press),
+            roll_angle: bds50.and_then(|b| b.roll_angle),
+            track_angle: bds50.and_then(|b| b.track_angle),
+            ground_speed_bds: bds50.and_then(|b| b.gs),
+            track_angle_rate: bds50.and_then(|b| b.ta_rate),
+            tas: bds50.and_then(|b| b.tas),
+            magnetic_heading_bds: bds60.and_then(|b| b.mag_h),
+            ias: bds60.and_then(|b| b.ias),
+            mach: bds60.and_then(|b| b.mach),
+            barometric_altitude_rate: bds60.and_then(|b| b.bar_rate),
+            inertial_vertical_velocity: bds60.and_then(|b| b.inert_vv),
+            track_number: m.track_number.map(f64::from),
+            ground_speed: velocity.map(|v| v.groundspeed),
+            magnetic_heading: velocity.map(|v| v.heading),
+            stat: m.stat_cat48,
+            gbs: m.gbs,
+            is_pure: m.is_pure,
+            is_static: m.is_static,
+        }
+    }
+}
+
+impl From<Cat21> for Row {
+    fn from(m: Cat21) -> Self {
+        Row {
+            category: Some(m.category as i64),
+            sac: m.sac.map(f64::from),
+            sic: m.sic.map(f64::from),
+            time_of_day: m.time_of_reception_position,
+            time_string: m.utc_time,
+            latitude: m.latitude,
+            longitude: m.longitude,
+            height_m: m.height_m,
+            height_ft: m.height_ft,
+            altitude_m: m.altitude_m,
+            altitude_ft: m.altitude_ft,
+            mode3a_code: m.mode3a_code,
+            flight_level: m.flight_level,
+            target_identification: m.target_identification,
+            barometric_pressure_setting: m.barometric_pressure_setting,
+            ias: m.ias,
+            mach: m.mach,
+            magnetic_heading: m.magnetic_heading,
+            gbs: m.gbs.map(|g| g != 0),
+            is_static: m.is_static,
+            ..Default::default()
+        }
+    }
+}
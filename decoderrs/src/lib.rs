@@ -1,13 +1,20 @@
 use bitvec::prelude::*;
+use pyo3::buffer::PyBuffer;
 use pyo3::prelude::*;
 use pyo3::types::{PyDict, PyList};
+use rayon::prelude::*;
 use serde_json::Value;
 use std::fs::File;
 use std::io::Read;
+use std::ops::Range;
 
 mod cat21;
 mod cat48;
+mod columns;
 mod geoutils;
+mod reader;
+mod source;
+use columns::{Columns, Row};
 use geoutils::CoordinatesWGS84;
 
 /// Recursively convert a serde_json `Value` into native Python objects.
@@ -44,43 +51,18 @@ fn json_to_py(py: Python, value: &Value) -> PyResult<PyObject> {
     }
 }
 
-/// Decode an ASTERIX capture file using the Rust pipelines and return Python objects.
-#[pyfunction(
-    signature = (file_path, radar_lat, radar_lon, radar_alt, max_messages=None, debug_save_path=None)
-)]
-fn load(
-    py: Python,
-    file_path: String,
-    radar_lat: f64,
-    radar_lon: f64,
-    radar_alt: f64,
-    max_messages: Option<usize>,
-    debug_save_path: Option<String>,
-) -> PyObject {
-    let mut file = match File::open(file_path) {
-        Ok(file) => file,
-        Err(_) => return py.None(),
-    };
-    let mut buffer = Vec::new();
-    if file.read_to_end(&mut buffer).is_err() {
-        return py.None();
-    }
-
-    let radar_coords = CoordinatesWGS84 {
-        lat: radar_lat,
-        lon: radar_lon,
-        height: radar_alt,
-    };
-
-    let bv = buffer.view_bits::<Msb0>();
-    let mut json_results: Vec<Value> = Vec::new();
+/// Locate the ASTERIX data blocks in `bv`, returning their category and body range.
+///
+/// Only CAT21/CAT48 blocks are kept and `max_messages` caps how many are
+/// returned, so the decode stage never sees blocks it would throw away.
+fn frame_blocks(bv: &BitSlice<u8, Msb0>, max_messages: Option<usize>) -> Vec<(u8, Range<usize>)> {
+    let mut blocks = Vec::new();
     let mut current_pos = 0;
     let total_bits = bv.len();
-    let mut message_count = 0;
 
     while current_pos + 24 <= total_bits {
         if let Some(max) = max_messages {
-            if message_count >= max {
+            if blocks.len() >= max {
                 break;
             }
         }
@@ -98,47 +80,330 @@ fn load(
             break;
         }
 
-        let data_slice = &bv[current_pos + 24..data_end];
-
-        let json_value = match cat {
-            21 => {
-                let decoded = cat21::decode_cat21(cat, data_slice);
-                Some(serde_json::to_value(decoded).unwrap())
-            }
-            48 => {
-                let decoded = cat48::decode_cat48(cat, data_slice, Some(radar_coords));
-                Some(serde_json::to_value(decoded).unwrap())
-            }
-            _ => None,
-        };
-
-        if let Some(value) = json_value {
-            json_results.push(value);
-            message_count += 1;
+        if cat == 21 || cat == 48 {
+            blocks.push((cat, current_pos + 24..data_end));
         }
 
         current_pos = data_end;
     }
 
-    if let Some(path) = debug_save_path {
-        if let Ok(out_file) = File::create(path) {
-            let _ = serde_json::to_writer_pretty(out_file, &json_results);
+    blocks
+}
+
+/// A decoded data block of one of the supported categories.
+enum Decoded {
+    Cat21(cat21::Cat21),
+    Cat48(cat48::Cat48),
+}
+
+impl Decoded {
+    fn into_json(self) -> Value {
+        match self {
+            Decoded::Cat21(decoded) => serde_json::to_value(decoded).unwrap(),
+            Decoded::Cat48(decoded) => serde_json::to_value(decoded).unwrap(),
+        }
+    }
+}
+
+impl From<Decoded> for Row {
+    fn from(decoded: Decoded) -> Self {
+        match decoded {
+            Decoded::Cat21(decoded) => Row::from(decoded),
+            Decoded::Cat48(decoded) => Row::from(decoded),
         }
     }
+}
+
+/// Decode one data block body.
+fn decode_block(
+    cat: u8,
+    data_slice: &BitSlice<u8, Msb0>,
+    radar_coords: CoordinatesWGS84,
+) -> Option<Decoded> {
+    match cat {
+        21 => Some(Decoded::Cat21(cat21::decode_cat21(cat, data_slice))),
+        48 => Some(Decoded::Cat48(cat48::decode_cat48(
+            cat,
+            data_slice,
+            Some(radar_coords),
+        ))),
+        _ => None,
+    }
+}
+
+/// Frame and decode a whole capture held in memory, mapping each record with `convert`.
+///
+/// Blocks are independent once framed, so with `parallel` they are decoded
+/// (and converted) across a rayon pool (`num_threads` workers, or one per
+/// core). Output keeps the on-disk order either way.
+fn decode_buffer<T: Send>(
+    buffer: &[u8],
+    radar_coords: CoordinatesWGS84,
+    max_messages: Option<usize>,
+    parallel: bool,
+    num_threads: Option<usize>,
+    convert: fn(Decoded) -> T,
+) -> Vec<T> {
+    let bv = buffer.view_bits::<Msb0>();
+    let blocks = frame_blocks(bv, max_messages);
 
+    if !parallel {
+        return blocks
+            .iter()
+            .filter_map(|(cat, range)| decode_block(*cat, &bv[range.clone()], radar_coords))
+            .map(convert)
+            .collect();
+    }
+
+    let decode_all = || -> Vec<T> {
+        blocks
+            .par_iter()
+            .filter_map(|(cat, range)| decode_block(*cat, &bv[range.clone()], radar_coords))
+            .map(convert)
+            .collect()
+    };
+    match num_threads {
+        Some(n) => match rayon::ThreadPoolBuilder::new().num_threads(n).build() {
+            Ok(pool) => pool.install(decode_all),
+            Err(_) => decode_all(),
+        },
+        None => decode_all(),
+    }
+}
+
+/// Decode a capture held in memory into dashboard columns.
+fn decode_columns(
+    buffer: &[u8],
+    radar_coords: CoordinatesWGS84,
+    max_messages: Option<usize>,
+    parallel: bool,
+    num_threads: Option<usize>,
+) -> Columns {
+    let rows = decode_buffer(
+        buffer,
+        radar_coords,
+        max_messages,
+        parallel,
+        num_threads,
+        Row::from,
+    );
+    let mut columns = Columns::with_capacity(rows.len());
+    for row in rows {
+        columns.push(row);
+    }
+    columns
+}
+
+/// Build the Python list of dicts returned by the dict-based entry points.
+fn values_to_list(py: Python, values: Vec<Value>) -> PyObject {
     let list = PyList::empty_bound(py);
-    for value in json_results {
+    for value in values {
         if let Ok(py_value) = json_to_py(py, &value) {
             list.append(py_value).unwrap();
         }
     }
-
     list.to_object(py)
 }
 
+/// Borrow the bytes behind a read-only Python buffer; writable or
+/// non-contiguous buffers are copied.
+///
+/// The bytes are decoded with the GIL released, so a writable buffer
+/// (`bytearray`, an `mmap` opened with `ACCESS_WRITE`...) could be written
+/// by another Python thread meanwhile; only read-only ones are shared.
+fn buffer_bytes<'a>(
+    py: Python,
+    data: &'a PyBuffer<u8>,
+    owned: &'a mut Vec<u8>,
+) -> PyResult<&'a [u8]> {
+    if data.readonly() && data.is_c_contiguous() {
+        // SAFETY: `data` keeps the exporter's buffer alive and pinned for 'a
+        // (Python refuses to resize or close an object with live exports),
+        // the exporter hands out no writable view of a read-only buffer, and
+        // a C-contiguous buffer is exactly `len_bytes` bytes long.
+        Ok(unsafe { std::slice::from_raw_parts(data.buf_ptr() as *const u8, data.len_bytes()) })
+    } else {
+        *owned = data.to_vec(py)?;
+        Ok(owned.as_slice())
+    }
+}
+
+/// Read (and decompress) a whole capture; `None` when it cannot be read.
+fn read_file(file_path: &str) -> Option<Vec<u8>> {
+    let mut file = source::open_capture(file_path).ok()?;
+    let mut buffer = Vec::new();
+    file.read_to_end(&mut buffer).ok()?;
+    Some(buffer)
+}
+
+/// Decode an ASTERIX capture file using the Rust pipelines and return Python objects.
+///
+/// The GIL is released while the file is read, framed and decoded, so other
+/// Python threads (e.g. the dashboard render loop) keep running; it is only
+/// re-acquired to build the returned list.
+#[pyfunction(
+    signature = (file_path, radar_lat, radar_lon, radar_alt, max_messages=None, debug_save_path=None, parallel=false, num_threads=None)
+)]
+fn load(
+    py: Python,
+    file_path: String,
+    radar_lat: f64,
+    radar_lon: f64,
+    radar_alt: f64,
+    max_messages: Option<usize>,
+    debug_save_path: Option<String>,
+    parallel: bool,
+    num_threads: Option<usize>,
+) -> PyObject {
+    let radar_coords = CoordinatesWGS84 {
+        lat: radar_lat,
+        lon: radar_lon,
+        height: radar_alt,
+    };
+
+    let json_results = py.allow_threads(|| -> Option<Vec<Value>> {
+        let buffer = read_file(&file_path)?;
+        let json_results = decode_buffer(
+            &buffer,
+            radar_coords,
+            max_messages,
+            parallel,
+            num_threads,
+            Decoded::into_json,
+        );
+
+        if let Some(path) = debug_save_path {
+            if let Ok(out_file) = File::create(path) {
+                let _ = serde_json::to_writer_pretty(out_file, &json_results);
+            }
+        }
+        Some(json_results)
+    });
+    match json_results {
+        Some(values) => values_to_list(py, values),
+        None => py.None(),
+    }
+}
+
+/// Decode ASTERIX data already in memory (any buffer-protocol object).
+///
+/// `data` may be `bytes`, `bytearray`, `memoryview`, `mmap` or any other
+/// byte buffer. Read-only contiguous buffers (`bytes`, a read-only `mmap` or
+/// memoryview) are decoded in place without copying; writable ones such as
+/// `bytearray` are copied first, since they are decoded with the GIL
+/// released and another thread could write to them meanwhile. Otherwise
+/// behaves like `load`.
+#[pyfunction(
+    signature = (data, radar_lat, radar_lon, radar_alt, max_messages=None, parallel=false, num_threads=None)
+)]
+fn load_buffer(
+    py: Python,
+    data: PyBuffer<u8>,
+    radar_lat: f64,
+    radar_lon: f64,
+    radar_alt: f64,
+    max_messages: Option<usize>,
+    parallel: bool,
+    num_threads: Option<usize>,
+) -> PyResult<PyObject> {
+    let radar_coords = CoordinatesWGS84 {
+        lat: radar_lat,
+        lon: radar_lon,
+        height: radar_alt,
+    };
+    let mut owned = Vec::new();
+    let bytes = buffer_bytes(py, &data, &mut owned)?;
+
+    let json_results = py.allow_threads(|| {
+        decode_buffer(
+            bytes,
+            radar_coords,
+            max_messages,
+            parallel,
+            num_threads,
+            Decoded::into_json,
+        )
+    });
+    Ok(values_to_list(py, json_results))
+}
+
+/// Decode an ASTERIX capture file straight into NumPy columns.
+///
+/// Returns a dict mapping every dashboard column (`ALL_EXPECTED_COLUMNS`) to
+/// an array with one entry per decoded record, skipping the serde_json and
+/// per-message dict round-trip of `load`. Missing values are NaN in float
+/// columns and `None` in object columns. Returns `None` if the file cannot
+/// be read.
+#[pyfunction(
+    signature = (file_path, radar_lat, radar_lon, radar_alt, max_messages=None, parallel=false, num_threads=None)
+)]
+fn load_columns(
+    py: Python,
+    file_path: String,
+    radar_lat: f64,
+    radar_lon: f64,
+    radar_alt: f64,
+    max_messages: Option<usize>,
+    parallel: bool,
+    num_threads: Option<usize>,
+) -> PyResult<PyObject> {
+    let radar_coords = CoordinatesWGS84 {
+        lat: radar_lat,
+        lon: radar_lon,
+        height: radar_alt,
+    };
+
+    let columns = py.allow_threads(|| -> Option<Columns> {
+        let buffer = read_file(&file_path)?;
+        Some(decode_columns(
+            &buffer,
+            radar_coords,
+            max_messages,
+            parallel,
+            num_threads,
+        ))
+    });
+
+    match columns {
+        Some(columns) => Ok(columns.into_pydict(py)?.into_any().unbind()),
+        None => Ok(py.None()),
+    }
+}
+
+/// Columnar counterpart of `load_buffer`; see `load_columns`.
+#[pyfunction(
+    signature = (data, radar_lat, radar_lon, radar_alt, max_messages=None, parallel=false, num_threads=None)
+)]
+fn load_columns_buffer(
+    py: Python,
+    data: PyBuffer<u8>,
+    radar_lat: f64,
+    radar_lon: f64,
+    radar_alt: f64,
+    max_messages: Option<usize>,
+    parallel: bool,
+    num_threads: Option<usize>,
+) -> PyResult<PyObject> {
+    let radar_coords = CoordinatesWGS84 {
+        lat: radar_lat,
+        lon: radar_lon,
+        height: radar_alt,
+    };
+    let mut owned = Vec::new();
+    let bytes = buffer_bytes(py, &data, &mut owned)?;
+
+    let columns = py
+        .allow_threads(|| decode_columns(bytes, radar_coords, max_messages, parallel, num_threads));
+    Ok(columns.into_pydict(py)?.into_any().unbind())
+}
+
 /// A Python module implemented in Rust.
 #[pymodule]
 fn decoderrs(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(load, m)?)?;
+    m.add_function(wrap_pyfunction!(load_columns, m)?)?;
+    m.add_function(wrap_pyfunction!(load_buffer, m)?)?;
+    m.add_function(wrap_pyfunction!(load_columns_buffer, m)?)?;
+    m.add_class::<reader::Reader>()?;
     Ok(())
 }
@@ -0,0 +1,186 @@
+use crate::columns::Columns;
+use crate::geoutils::CoordinatesWGS84;
+use crate::source::open_capture;
+use crate::{decode_buffer, decode_columns, json_to_py, Decoded};
+use pyo3::exceptions::PyIOError;
+use pyo3::prelude::*;
+use pyo3::types::PyList;
+use serde_json::Value;
+use std::io::{BufReader, ErrorKind, Read};
+
+/// One batch of decoded records, still free of Python objects.
+enum Batch {
+    Dicts(Vec<Value>),
+    Columns(Columns),
+}
+
+/// Streaming reader yielding fixed-size batches of decoded records.
+///
+/// Only one batch of raw blocks and decoded records is alive at a time, so a
+/// capture of any size is processed in constant memory. Each batch is a list
+/// of dicts (like `load`) or, with `columnar=True`, a dict of NumPy arrays
+/// (like `load_columns`). The GIL is released while a batch is read and
+/// decoded.
+#[pyclass(module = "decoderrs")]
+pub struct Reader {
+    reader: BufReader<Box<dyn Read + Send>>,
+    radar_coords: CoordinatesWGS84,
+    batch_size: usize,
+    columnar: bool,
+    parallel: bool,
+    remaining: Option<usize>,
+    done: bool,
+    bytes_read: u64,
+}
+
+impl Reader {
+    /// Copy whole data blocks into `chunk` until `batch_size` supported
+    /// records are buffered or the input ends.
+    fn fill_chunk(&mut self, chunk: &mut Vec<u8>) -> std::io::Result<usize> {
+        let mut limit = self.batch_size;
+        if let Some(remaining) = self.remaining {
+            limit = limit.min(remaining);
+        }
+        let mut count = 0;
+        let mut header = [0u8; 3];
+
+        while count < limit {
+            if let Err(err) = self.reader.read_exact(&mut header) {
+                if err.kind() == ErrorKind::UnexpectedEof {
+                    self.done = true;
+                    break;
+                }
+                return Err(err);
+            }
+            let cat = header[0];
+            let length = u16::from_be_bytes([header[1], header[2]]) as usize;
+            if length < 3 {
+                self.done = true;
+                break;
+            }
+
+            let start = chunk.len();
+            chunk.extend_from_slice(&header);
+            chunk.resize(start + length, 0);
+            if let Err(err) = self.reader.read_exact(&mut chunk[start + 3..]) {
+                // Truncated trailing block: drop it and stop, like `load`.
+                chunk.truncate(start);
+                self.done = true;
+                if err.kind() == ErrorKind::UnexpectedEof {
+                    break;
+                }
+                return Err(err);
+            }
+            self.bytes_read += length as u64;
+            if cat == 21 || cat == 48 {
+                count += 1;
+            } else {
+                chunk.truncate(start);
+            }
+        }
+
+        if let Some(remaining) = self.remaining.as_mut() {
+            *remaining -= count;
+            if *remaining == 0 {
+                self.done = true;
+            }
+        }
+        Ok(count)
+    }
+
+    /// Read and decode the next batch; `None` once the input is exhausted.
+    fn next_batch(&mut self) -> std::io::Result<Option<Batch>> {
+        if self.done {
+            return Ok(None);
+        }
+        let mut chunk = Vec::new();
+        if self.fill_chunk(&mut chunk)? == 0 {
+            return Ok(None);
+        }
+
+        let batch = if self.columnar {
+            Batch::Columns(decode_columns(
+                &chunk,
+                self.radar_coords,
+                None,
+                self.parallel,
+                None,
+            ))
+        } else {
+            Batch::Dicts(decode_buffer(
+                &chunk,
+                self.radar_coords,
+                None,
+                self.parallel,
+                None,
+                Decoded::into_json,
+            ))
+        };
+        Ok(Some(batch))
+    }
+}
+
+#[pymethods]
+impl Reader {
+    #[new]
+    #[pyo3(
+        signature = (file_path, radar_lat, radar_lon, radar_alt, batch_size=10000, columnar=false, max_messages=None, parallel=false)
+    )]
+    fn new(
+        file_path: String,
+        radar_lat: f64,
+        radar_lon: f64,
+        radar_alt: f64,
+        batch_size: usize,
+        columnar: bool,
+        max_messages: Option<usize>,
+        parallel: bool,
+    ) -> PyResult<Self> {
+        let source = open_capture(&file_path)
+            .map_err(|err| PyIOError::new_err(format!("{}: {}", file_path, err)))?;
+        Ok(Reader {
+            reader: BufReader::with_capacity(1 << 20, source),
+            radar_coords: CoordinatesWGS84 {
+                lat: radar_lat,
+                lon: radar_lon,
+                height: radar_alt,
+            },
+            batch_size: batch_size.max(1),
+            columnar,
+            parallel,
+            remaining: max_messages,
+            done: max_messages == Some(0),
+            bytes_read: 0,
+        })
+    }
+
+    /// Capture bytes (after decompression) consumed so far.
+    #[getter]
+    fn bytes_read(&self) -> u64 {
+        self.bytes_read
+    }
+
+    fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+
+    fn __next__(mut slf: PyRefMut<'_, Self>) -> PyResult<Option<PyObject>> {
+        let py = slf.py();
+        let reader: &mut Reader = &mut slf;
+        let batch = py
+            .allow_threads(|| reader.next_batch())
+            .map_err(|err| PyIOError::new_err(err.to_string()))?;
+
+        match batch {
+            None => Ok(None),
+            Some(Batch::Columns(columns)) => Ok(Some(columns.into_pydict(py)?.into_any().unbind())),
+            Some(Batch::Dicts(values)) => {
+                let list = PyList::empty_bound(py);
+                for value in values {
+                    list.append(json_to_py(py, &value)?)?;
+                }
+                Ok(Some(list.into_any().unbind()))
+            }
+        }
+    }
+}
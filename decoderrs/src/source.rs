@@ -0,0 +1,38 @@
+use flate2::read::MultiGzDecoder;
+use std::fs::File;
+use std::io::{BufReader, Read, Seek, SeekFrom};
+use xz2::read::XzDecoder;
+
+const GZIP_MAGIC: &[u8] = &[0x1f, 0x8b, 0x08];
+const XZ_MAGIC: &[u8] = &[0xfd, b'7', b'z', b'X', b'Z', 0x00];
+const ZSTD_MAGIC: &[u8] = &[0x28, 0xb5, 0x2f, 0xfd];
+
+/// Open a capture, transparently decompressing gzip, xz or zstd input.
+///
+/// The format is detected from the magic bytes, matching
+/// `decoder.compression` on the Python side. Decompression is streamed, so
+/// callers read plain ASTERIX bytes without a temporary decompressed file.
+pub fn open_capture(file_path: &str) -> std::io::Result<Box<dyn Read + Send>> {
+    let mut file = File::open(file_path)?;
+    let mut head = [0u8; 6];
+    let mut filled = 0;
+    while filled < head.len() {
+        let n = file.read(&mut head[filled..])?;
+        if n == 0 {
+            break;
+        }
+        filled += n;
+    }
+    file.seek(SeekFrom::Start(0))?;
+    let head = &head[..filled];
+
+    Ok(if head.starts_with(GZIP_MAGIC) {
+        Box::new(MultiGzDecoder::new(BufReader::new(file)))
+    } else if head.starts_with(XZ_MAGIC) {
+        Box::new(XzDecoder::new_multi_decoder(BufReader::new(file)))
+    } else if head.starts_with(ZSTD_MAGIC) {
+        Box::new(zstd::stream::read::Decoder::new(file)?)
+    } else {
+        Box::new(file)
+    })
+}
@@ -0,0 +1,182 @@
+"""Incremental row filtering for the dashboard tables.
+
+:class:`FilterEngine` keeps one boolean mask per filter dimension (latitude
+range, category, ...) and recomputes only the dimension whose parameters
+changed. The AND of all the other dimensions is cached as well, so dragging
+a slider costs one comparison pass over its column plus one AND, however
+many filters are active. Rows appended with :meth:`FilterEngine.extend` are
+filtered on their own and their masks appended to the existing ones.
+"""
+
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+
+def category_mask(series: pd.Series, value) -> np.ndarray:
+    """Boolean mask of ``series == value``, comparing codes for categoricals."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        code = series.cat.categories.get_indexer([value])[0]
+        if code < 0:
+            return np.zeros(len(series), dtype=bool)
+        return series.cat.codes.to_numpy() == code
+    return (series == value).to_numpy(dtype=bool, na_value=False)
+
+
+def range_mask(series: pd.Series, low, high) -> np.ndarray:
+    """Boolean mask of ``low <= series <= high`` (NaN never matches)."""
+    values = series.to_numpy(dtype=float, na_value=np.nan)
+    mask = values >= low
+    mask &= values <= high
+    return mask
+
+
+def _combine(masks, skip=None):
+    """AND of the ``masks`` values other than ``skip`` (``None`` if none)."""
+    masks = [m for n, m in masks.items() if n != skip and m is not None]
+    if not masks:
+        return None
+    combined = masks[0].copy()
+    for mask in masks[1:]:
+        combined &= mask
+    return combined
+
+
+class FilterEngine:
+    """Cached per-dimension masks over a DataFrame.
+
+    Example:
+
+        engine = FilterEngine(df)
+        engine.set_range("altitude", "Altitude (m)", 0, 3000)
+        engine.set_equal("category", "Category", 21)
+        rows = engine.subset()
+
+    ``concat`` joins the table with rows added by :meth:`extend`; it is only
+    called when the whole table is needed (``df`` and :meth:`subset`).
+    """
+
+    def __init__(self, df: pd.DataFrame, concat=None):
+        self._parts = [df]
+        self._length = len(df)
+        self._concat = concat or partial(pd.concat, ignore_index=True)
+        self._params = {}
+        # Per dimension, the function computing its mask over some rows.
+        self._compute = {}
+        self._masks = {}
+        # Name of the last dimension changed and the AND of all the others.
+        self._others_name = None
+        self._others = None
+        self._mask = None
+        self._indices = None
+        self._subset = None
+
+    def set_range(self, name, column, low, high):
+        """Keep rows with ``low <= column <= high`` (NaN never matches).
+
+        Returns ``True`` if the selection may have changed.
+        """
+        params = (column, low, high)
+        if self._params.get(name) == params:
+            return False
+
+        def compute(df):
+            return range_mask(df[column], low, high)
+
+        self._update(name, params, compute)
+        return True
+
+    def set_equal(self, name, column, value):
+        """Keep rows where ``column == value``; ``None`` clears the filter.
+
+        Returns ``True`` if the selection may have changed.
+        """
+        params = (column, value)
+        if self._params.get(name, (column, None)) == params:
+            return False
+
+        def compute(df):
+            return category_mask(df[column], value)
+
+        self._update(name, params, None if value is None else compute)
+        return True
+
+    def extend(self, rows: pd.DataFrame):
+        """Append ``rows`` to the table, filtered with the current settings.
+
+        Only the new rows are compared; their masks are appended to the
+        cached ones.
+        """
+        if rows.empty:
+            return
+        self._parts.append(rows)
+        self._length += len(rows)
+        masks = {
+            name: None if compute is None else compute(rows)
+            for name, compute in self._compute.items()
+        }
+        for name, mask in masks.items():
+            if mask is not None:
+                self._masks[name] = np.concatenate([self._masks[name], mask])
+        if self._others is not None:
+            others = _combine(masks, skip=self._others_name)
+            self._others = np.concatenate([self._others, others])
+        if self._mask is not None:
+            self._mask = np.concatenate([self._mask, _combine(masks)])
+        self._indices = None
+        self._subset = None
+
+    def _column_mask(self, compute):
+        """Mask of ``compute`` over all rows, evaluated part by part."""
+        if len(self._parts) == 1:
+            return compute(self._parts[0])
+        return np.concatenate([compute(part) for part in self._parts])
+
+    def _update(self, name, params, compute):
+        if self._others_name != name:
+            self._others = _combine(self._masks, skip=name)
+            self._others_name = name
+        mask = None if compute is None else self._column_mask(compute)
+        self._params[name] = params
+        self._compute[name] = compute
+        self._masks[name] = mask
+        if mask is None:
+            self._mask = self._others
+        elif self._others is None:
+            self._mask = mask
+        else:
+            self._mask = self._others & mask
+        self._indices = None
+        self._subset = None
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """The whole table, joining the parts added by :meth:`extend`."""
+        if len(self._parts) > 1:
+            self._parts = [self._concat(self._parts)]
+        return self._parts[0]
+
+    @property
+    def mask(self):
+        """Boolean mask of the selected rows, or ``None`` when all match."""
+        return self._mask
+
+    @property
+    def indices(self):
+        """Positions of the selected rows."""
+        if self._indices is None:
+            if self._mask is None:
+                self._indices = np.arange(self._length)
+            else:
+                self._indices = np.flatnonzero(self._mask)
+        return self._indices
+
+    def subset(self) -> pd.DataFrame:
+        """Selected rows in their original order (``df`` itself if all)."""
+        if self._subset is None:
+            if self._mask is None or len(self.indices) == self._length:
+                self._subset = self.df
+            else:
+                self._subset = self.df.iloc[self.indices]
+        return self._subset
@@ -0,0 +1,836 @@
+"""Frame-indexed views over the dashboard's per-frame table.
+
+:class:`FrameProvider` expands the decoded messages into one row per
+aircraft and frame, on demand, for the frames being drawn. That table is
+kept sorted by frame together with an offsets array (``offsets[f -
+min_frame]`` is the first row of frame ``f``), so the rows of any frame, or
+of a window of frames, are a contiguous slice instead of a boolean scan
+over the whole table. :class:`TrackTimeline`
+interpolates positions at any time, between frames, from the raw
+observations of each track, and nearest-target queries (hover and click
+hit-testing) go through a KD-tree over the markers as drawn.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+from scipy.spatial import cKDTree
+
+GROUND_STATUS_DTYPE = pd.CategoricalDtype(["On Ground", "Airborne", "Unknown"])
+
+# Per-frame aggregation: positions are averaged, everything else keeps the
+# first available value in the frame.
+PER_FRAME_AGG = {
+    "Latitude (deg)": "mean",
+    "Longitude (deg)": "mean",
+    "Altitude (m)": "mean",
+    "Height (m)": "first",
+    "Height (ft)": "first",
+    "IAS (kt)": "first",
+    "Magnetic Heading (deg)": "first",
+    "Ground Speed (kts)": "first",
+    "Roll Angle": "first",
+    "GBS": "first",
+    "STAT": "first",
+    "Time String": "first",
+    "Barometric Pressure Setting": "first",
+    "Track Angle": "first",
+    "Ground Speed (kts) BDS": "first",
+    "Track Angle Rate": "first",
+    "TAS": "first",
+    "Magnetic Heading (deg) BDS": "first",
+    "Barometric Altitude Rate": "first",
+    "Inertial Vertical Velocity": "first",
+    "Track Number": "first",
+    "Aircraft Address": "first",
+    "Flight Level (FL)": "first",
+    "Mode-3/A Code": "first",
+    "Is_Pure": "first",
+    "Is_Static": "first",
+    "Mach": "first",
+    "Theta (deg)": "first",
+    "Range (m)": "first",
+    "Range (NM)": "first",
+}
+# Columns linearly interpolated between frames; the rest are forward- then
+# back-filled within each aircraft.
+PER_FRAME_INTERP = ["Latitude (deg)", "Longitude (deg)", "Altitude (m)", "Roll Angle"]
+# Columns identifying an aircraft, and those its timeline needs.
+FRAME_KEYS = ["Target Identification", "Category"]
+TIMELINE_COLUMNS = FRAME_KEYS + [
+    "Time (s since midnight)",
+    "Longitude (deg)",
+    "Latitude (deg)",
+]
+# FrameProvider materialises frames in chunks of this many and keeps the
+# most recently used chunks.
+FRAME_CHUNK = 64
+FRAME_CACHE_CHUNKS = 8
+
+
+class FrameIndex:
+    """Rows of a DataFrame grouped by an integer frame column.
+
+    Build it once per data change (e.g. after filtering); lookups are O(1)
+    slices afterwards.
+    """
+
+    def __init__(self, df: pd.DataFrame, frame_col: str = "frame"):
+        frames = df[frame_col].to_numpy(dtype=np.int64)
+        if len(frames) and np.any(frames[1:] < frames[:-1]):
+            order = np.argsort(frames, kind="stable")
+            df = df.iloc[order]
+            frames = frames[order]
+        self.df = df.reset_index(drop=True)
+        self.frames = frames
+
+        if len(frames):
+            self.min_frame = int(frames[0])
+            self.max_frame = int(frames[-1])
+        else:
+            self.min_frame, self.max_frame = 0, -1
+        self.offsets = np.searchsorted(
+            frames, np.arange(self.min_frame, self.max_frame + 2)
+        )
+
+    def __len__(self):
+        return len(self.df)
+
+    def bounds(self, first, last=None):
+        """Row range ``[start, end)`` covering frames ``first..last``."""
+        if last is None:
+            last = first
+        first = max(first, self.min_frame)
+        last = min(last, self.max_frame)
+        if first > last:
+            return 0, 0
+        return (
+            int(self.offsets[first - self.min_frame]),
+            int(self.offsets[last - self.min_frame + 1]),
+        )
+
+    def frame(self, frame):
+        """Rows of a single frame."""
+        start, end = self.bounds(frame)
+        return self.df.iloc[start:end]
+
+    def window(self, first, last):
+        """Rows of frames ``first..last`` (inclusive), in frame order."""
+        start, end = self.bounds(first, last)
+        return self.df.iloc[start:end]
+
+
+class TrackIndex:
+    """Per-track position arrays for marker and trail updates.
+
+    Rows are sorted by track and frame, so the samples of one track within
+    a frame window are a contiguous range of ``x``/``y``; :meth:`ranges`
+    finds those ranges for every track at once with two ``searchsorted``.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        key_cols=("Target Identification", "Category"),
+        frame_col: str = "frame",
+        x_col: str = "Longitude (deg)",
+        y_col: str = "Latitude (deg)",
+    ):
+        key_cols = list(key_cols)
+        if df.empty:
+            track = np.zeros(0, dtype=np.int64)
+        else:
+            track = df.groupby(key_cols, observed=True, sort=False).ngroup()
+            track = track.to_numpy(dtype=np.int64)
+        frames = df[frame_col].to_numpy(dtype=np.int64)
+        order = np.lexsort((frames, track))
+
+        self.track = track[order]
+        self.frames = frames[order]
+        self.x = df[x_col].to_numpy(dtype=float)[order]
+        self.y = df[y_col].to_numpy(dtype=float)[order]
+
+        n_tracks = int(track.max()) + 1 if len(track) else 0
+        self.starts = np.searchsorted(self.track, np.arange(n_tracks + 1))
+        first_rows = order[self.starts[:-1]]
+        self.keys = list(
+            zip(*(df[col].to_numpy()[first_rows].tolist() for col in key_cols))
+        )
+
+        self.min_frame = int(self.frames.min()) if len(frames) else 0
+        self.max_frame = int(self.frames.max()) if len(frames) else -1
+        self._span = self.max_frame - self.min_frame + 1
+        self._composite = self.track * self._span + (self.frames - self.min_frame)
+        self._base = np.arange(n_tracks, dtype=np.int64) * self._span
+
+    def __len__(self):
+        return len(self.keys)
+
+    def ranges(self, first, last):
+        """Per-track ``(lo, hi)`` row ranges covering frames ``first..last``."""
+        first = max(first, self.min_frame)
+        last = min(last, self.max_frame)
+        if first > last:
+            empty = np.zeros(len(self.keys), dtype=np.int64)
+            return empty, empty
+        lo = np.searchsorted(self._composite, self._base + (first - self.min_frame))
+        hi = np.searchsorted(
+            self._composite, self._base + (last - self.min_frame), side="right"
+        )
+        return lo, hi
+
+    def at_frame(self, frame, lo, hi):
+        """Tracks whose range ``lo..hi`` ends with a sample at ``frame``."""
+        last = np.where(hi > lo, hi - 1, 0)
+        return (hi > lo) & (self.frames[last] == frame)
+
+
+class TrackTimeline:
+    """Per-track observation arrays for positions between frames.
+
+    Frames are whole seconds and average the observations inside them;
+    the timeline keeps every observation, sorted by track and time, and
+    :meth:`positions` interpolates all tracks linearly at an arbitrary time
+    with one ``searchsorted``. Outside a track's observations its first or
+    last position is held.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        key_cols=("Target Identification", "Category"),
+        time_col: str = "Time (s since midnight)",
+        x_col: str = "Longitude (deg)",
+        y_col: str = "Latitude (deg)",
+    ):
+        key_cols = list(key_cols)
+        x = df[x_col].to_numpy(dtype=float)
+        y = df[y_col].to_numpy(dtype=float)
+        times = df[time_col].to_numpy(dtype=float)
+        valid = np.isfinite(x) & np.isfinite(y) & np.isfinite(times)
+        df = df[valid]
+        if df.empty:
+            track = np.zeros(0, dtype=np.int64)
+        else:
+            track = df.groupby(key_cols, observed=True, sort=False).ngroup()
+            track = track.to_numpy(dtype=np.int64)
+        times = times[valid]
+        order = np.lexsort((times, track))
+
+        self.track = track[order]
+        self.times = times[order]
+        self.x = x[valid][order]
+        self.y = y[valid][order]
+
+        n_tracks = int(track.max()) + 1 if len(track) else 0
+        self.starts = np.searchsorted(self.track, np.arange(n_tracks + 1))
+        first_rows = order[self.starts[:-1]]
+        self.keys = list(
+            zip(*(df[col].to_numpy()[first_rows].tolist() for col in key_cols))
+        )
+
+        # Tracks laid end to end on one time axis, as in TrackIndex.
+        self._t0 = float(self.times.min()) if len(times) else 0.0
+        self._span = float(self.times.max()) - self._t0 + 1 if len(times) else 1.0
+        self._composite = self.track * self._span + (self.times - self._t0)
+        self._base = np.arange(n_tracks, dtype=np.int64) * self._span
+
+    def __len__(self):
+        return len(self.keys)
+
+    def positions(self, time):
+        """Interpolated ``(x, y)`` of every track at ``time``."""
+        start, end = self.starts[:-1], self.starts[1:] - 1
+        offset = min(max(time - self._t0, 0.0), self._span - 1)
+        after = np.searchsorted(self._composite, self._base + offset, side="right")
+        before = np.clip(after - 1, start, end)
+        after = np.clip(after, start, end)
+
+        gap = self.times[after] - self.times[before]
+        weight = np.divide(
+            time - self.times[before], gap, out=np.zeros(len(gap)), where=gap > 0
+        )
+        weight = np.clip(weight, 0.0, 1.0)
+        x = self.x[before] + (self.x[after] - self.x[before]) * weight
+        y = self.y[before] + (self.y[after] - self.y[before]) * weight
+        return x, y
+
+
+class MarkerIndex:
+    """Nearest drawn marker to a point, for hover and click hit-testing.
+
+    Built from the marker positions of one drawn frame (``shown`` marks the
+    tracks that have a marker); the KD-tree is built on the first query.
+    """
+
+    def __init__(self, x, y, shown):
+        self.tracks = np.flatnonzero(shown & np.isfinite(x) & np.isfinite(y))
+        self._points = np.column_stack((x[self.tracks], y[self.tracks]))
+        self._tree = None
+
+    def nearest(self, x, y, max_distance=np.inf):
+        """Track whose marker is closest to ``(x, y)``, or ``None`` if none
+        lies within ``max_distance``."""
+        if not len(self.tracks):
+            return None
+        if self._tree is None:
+            self._tree = cKDTree(self._points)
+        distance, i = self._tree.query((x, y), distance_upper_bound=max_distance)
+        if not np.isfinite(distance) or distance >= max_distance:
+            return None
+        return int(self.tracks[i])
+
+
+def concat_messages(frames) -> pd.DataFrame:
+    """``pd.concat`` that keeps categorical columns categorical.
+
+    Plain concatenation falls back to object dtype when the categories
+    differ; here they are unioned first, which only recodes the integers.
+    """
+    frames = [frame for frame in frames if not frame.empty] or frames[:1]
+    for col in frames[0].columns:
+        dtypes = [frame[col].dtype for frame in frames if col in frame.columns]
+        if len(dtypes) < 2 or not all(
+            isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes
+        ):
+            continue
+        categories = union_categoricals([frame[col] for frame in frames]).categories
+        frames = [
+            frame.assign(**{col: frame[col].cat.set_categories(categories)})
+            for frame in frames
+        ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def _nearest_known(known, group_start, group_end):
+    """Indices of the previous and next ``known`` rows within each group.
+
+    ``group_start``/``group_end`` give, per row, the first and last row index
+    of its group. Missing neighbours are -1.
+    """
+    idx = np.arange(len(known))
+    prev_idx = np.maximum.accumulate(np.where(known, idx, -1))
+    next_idx = np.where(known, idx, len(known))
+    next_idx = np.minimum.accumulate(next_idx[::-1])[::-1]
+    prev_idx = np.where(prev_idx >= group_start, prev_idx, -1)
+    next_idx = np.where(next_idx <= group_end, next_idx, -1)
+    return prev_idx, next_idx
+
+
+def _interp_groups(x, y, group_start, group_end):
+    """Linear interpolation of NaNs in ``y`` over ``x`` within each group.
+
+    Equivalent to ``np.interp`` per group on the known points (values
+    outside the known range take the nearest known value); groups without
+    any known value stay NaN.
+    """
+    known = ~np.isnan(y)
+    prev_idx, next_idx = _nearest_known(known, group_start, group_end)
+    has_prev = prev_idx >= 0
+    has_next = next_idx >= 0
+    y_prev = y[np.where(has_prev, prev_idx, 0)]
+    y_next = y[np.where(has_next, next_idx, 0)]
+    x_prev = x[np.where(has_prev, prev_idx, 0)]
+    x_next = x[np.where(has_next, next_idx, 0)]
+    span = x_next - x_prev
+    both = has_prev & has_next & (span != 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        weight = np.where(both, (x - x_prev) / np.where(both, span, 1), 0.0)
+    out = np.where(has_prev, y_prev, y_next) + np.where(
+        both, (y_next - y_prev) * weight, 0.0
+    )
+    out[~has_prev & ~has_next] = np.nan
+    out[known] = y[known]
+    return out
+
+
+def _take(series: pd.Series, index: np.ndarray) -> pd.Series:
+    """``series.iloc[index]`` where ``index == -1`` yields a missing value."""
+    missing = index < 0
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()[np.where(missing, 0, index)]
+        codes = np.where(missing, -1, codes)
+        return pd.Series(pd.Categorical.from_codes(codes, dtype=series.dtype))
+    values = series.to_numpy()[np.where(missing, 0, index)]
+    if missing.any():
+        if values.dtype.kind == "f":
+            values[missing] = np.nan
+        else:
+            values = values.astype(object)
+            values[missing] = None
+    return pd.Series(values)
+
+
+def ground_status(df: pd.DataFrame) -> pd.Categorical:
+    """Ground/airborne status of each row from CAT48 STAT and CAT21 GBS.
+
+    A STAT saying only "on ground" or only "airborne" decides; otherwise a
+    present GBS does (True means on ground). Anything else is "Unknown".
+    """
+    status = np.full(len(df), "Unknown", dtype=object)
+    decided = np.zeros(len(df), dtype=bool)
+    if "STAT" in df.columns:
+        stat = df["STAT"].astype("category")
+        categories = stat.cat.categories.astype(str)
+        on_ground = np.asarray(categories.str.contains("on ground", regex=False))
+        airborne = np.asarray(categories.str.contains("airborne", regex=False))
+        codes = stat.cat.codes.to_numpy()
+        present = codes >= 0
+        safe = np.where(present, codes, 0)
+        ground_row = present & on_ground[safe] & ~airborne[safe]
+        air_row = present & airborne[safe] & ~on_ground[safe]
+        status[ground_row] = "On Ground"
+        status[air_row] = "Airborne"
+        decided = ground_row | air_row
+    if "GBS" in df.columns:
+        gbs = df["GBS"]
+        has_gbs = gbs.notna().to_numpy() & ~decided
+        gbs_true = gbs.eq(True).to_numpy()
+        status[has_gbs & gbs_true] = "On Ground"
+        status[has_gbs & ~gbs_true] = "Airborne"
+    return pd.Categorical(status, dtype=GROUND_STATUS_DTYPE)
+
+
+def _ranges(starts, lengths):
+    """Concatenation of ``arange(start, start + length)`` for each pair."""
+    offsets = np.cumsum(lengths) - lengths
+    return np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())
+
+
+class _FramePart:
+    """Per-frame buckets of some aircraft, built from all of their messages.
+
+    ``df`` may hold rows without an aircraft key; they are ignored. Each
+    aircraft is reduced independently of the others, so the aircraft of a
+    part can be moved to another one without changing their frames.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        keys = FRAME_KEYS
+        self.df = df
+        valid = np.flatnonzero(df[keys].notna().all(axis=1).to_numpy())
+
+        # Sort once by aircraft (in groupby key order) and time; ``rows``
+        # maps sorted positions back to rows of ``df``.
+        group_id = (
+            df.iloc[valid].groupby(keys, observed=True, sort=True).ngroup().to_numpy()
+        )
+        time_s = df["Time (s since midnight)"].to_numpy(dtype=float)[valid]
+        order = np.lexsort((time_s, group_id))
+        rows = valid[order]
+        group_id = group_id[order]
+        time_s = time_s[order]
+        n_rows = len(rows)
+
+        starts = np.flatnonzero(np.r_[True, group_id[1:] != group_id[:-1]])[:n_rows]
+        ends = np.r_[starts[1:], n_rows] - 1
+        row_group = np.repeat(np.arange(len(starts)), ends - starts + 1)
+        altitude = _interp_groups(
+            time_s,
+            df["Altitude (m)"].to_numpy(dtype=float)[rows],
+            starts[row_group],
+            ends[row_group],
+        )
+        self._rows = rows
+        self._row_start = starts
+        self._row_count = ends - starts + 1
+        self.keys = list(
+            zip(*(df[col].to_numpy()[rows[starts]].tolist() for col in keys))
+        )
+        # False for aircraft whose messages have moved to a newer part.
+        self.live = np.ones(len(starts), dtype=bool)
+        self.size = n_rows
+        # Aircraft of each group, set by the provider.
+        self.ids = None
+
+        # One bucket per aircraft and frame.
+        frames = df["frame"].to_numpy(dtype=np.int64)[rows]
+        bucket_start = np.flatnonzero(
+            np.r_[True, (group_id[1:] != group_id[:-1]) | (frames[1:] != frames[:-1])]
+        )[:n_rows]
+        bucket_end = np.r_[bucket_start[1:], n_rows]
+        bucket_group = row_group[bucket_start]
+        bucket_of_row = np.repeat(
+            np.arange(len(bucket_start)), bucket_end - bucket_start
+        )
+        self._bucket_frame = frames[bucket_start]
+        self._bucket_group = bucket_group
+
+        n_groups = len(starts)
+        group_bucket_start = np.searchsorted(bucket_group, np.arange(n_groups))
+        group_bucket_end = (
+            np.r_[group_bucket_start[1:], len(bucket_start)][:n_groups] - 1
+        )
+        self._group_row = rows[starts]
+        self.group_first = self._bucket_frame[group_bucket_start]
+        self.group_last = self._bucket_frame[group_bucket_end]
+        if n_groups:
+            self.min_frame = int(self.group_first.min())
+            self.max_frame = int(self.group_last.max())
+        else:
+            self.min_frame, self.max_frame = 0, -1
+        self._span = self.max_frame - self.min_frame + 1
+        self._composite = bucket_group * self._span + (
+            self._bucket_frame - self.min_frame
+        )
+        bucket_lo = group_bucket_start[bucket_group]
+        bucket_hi = group_bucket_end[bucket_group]
+
+        # Float columns keep their bucket values with the nearest known
+        # bucket on each side; other columns keep, per bucket, the row of
+        # ``df`` holding the forward/back-filled value.
+        self._values = {}
+        self._fill = {}
+        self.columns = [col for col in PER_FRAME_AGG if col in df.columns]
+        row_idx = np.arange(n_rows)
+        for col in self.columns:
+            if PER_FRAME_AGG[col] == "mean":
+                if col == "Altitude (m)":
+                    values = altitude
+                else:
+                    values = df[col].to_numpy(dtype=float)[rows]
+                known = ~np.isnan(values)
+                sums = np.bincount(
+                    bucket_of_row,
+                    np.where(known, values, 0.0),
+                    minlength=len(bucket_start),
+                )
+                counts = np.bincount(bucket_of_row, known, minlength=len(bucket_start))
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    bucket_values = sums / counts
+            else:
+                known = df[col].notna().to_numpy()[rows]
+                if n_rows:
+                    first_known = np.minimum.reduceat(
+                        np.where(known, row_idx, n_rows), bucket_start
+                    )
+                else:
+                    first_known = np.zeros(0, dtype=np.int64)
+                first_known = np.where(first_known < bucket_end, first_known, -1)
+                source = np.where(first_known >= 0, rows[first_known], -1)
+                if col not in PER_FRAME_INTERP:
+                    prev_idx, next_idx = _nearest_known(
+                        source >= 0, bucket_lo, bucket_hi
+                    )
+                    fill = np.where(prev_idx >= 0, prev_idx, next_idx)
+                    self._fill[col] = np.where(
+                        fill >= 0, source[np.maximum(fill, 0)], -1
+                    )
+                    continue
+                bucket_values = _take(df[col], source).to_numpy(dtype=float)
+            prev_idx, next_idx = _nearest_known(
+                ~np.isnan(bucket_values), bucket_lo, bucket_hi
+            )
+            self._values[col] = (bucket_values, prev_idx, next_idx)
+
+        # Aircraft that ever have a position: the rows of all others have
+        # NaN coordinates on every frame and are dropped by the dashboard.
+        self.drawable = np.ones(n_groups, dtype=bool)
+        for col in ("Latitude (deg)", "Longitude (deg)"):
+            known = ~np.isnan(self._values[col][0])
+            self.drawable &= np.bincount(bucket_group, known, minlength=n_groups) > 0
+        altitude = self._values["Altitude (m)"][0]
+        if n_groups:
+            self.altitude_low = np.fmin.reduceat(altitude, group_bucket_start)
+            self.altitude_high = np.fmax.reduceat(altitude, group_bucket_start)
+        else:
+            self.altitude_low = self.altitude_high = np.zeros(0)
+
+        # Observations for marker positions between frames, with the part's
+        # aircraft of each timeline track.
+        self.timeline = TrackTimeline(df[TIMELINE_COLUMNS].iloc[rows])
+        group_of = {key: group for group, key in enumerate(self.keys)}
+        self.timeline_group = np.array(
+            [group_of[key] for key in self.timeline.keys], dtype=np.int64
+        )
+
+    def messages(self, groups) -> pd.DataFrame:
+        """Messages of the aircraft ``groups``, which leave this part."""
+        self.live[groups] = False
+        self.size -= int(self._row_count[groups].sum())
+        index = _ranges(self._row_start[groups], self._row_count[groups])
+        return self.df.iloc[self._rows[index]]
+
+    def materialize(self, first, last):
+        """Per-frame rows of the live aircraft in frames ``first..last``.
+
+        Returns the rows, sorted by frame and aircraft, and the aircraft of
+        each row.
+        """
+        # Dense (aircraft, frame) pairs of the aircraft alive in the range.
+        alive = np.flatnonzero(
+            self.live & (self.group_first <= last) & (self.group_last >= first)
+        )
+        lo = np.maximum(self.group_first[alive], first)
+        lengths = np.minimum(self.group_last[alive], last) - lo + 1
+        dense_group = np.repeat(alive, lengths)
+        dense_frame = _ranges(lo, lengths)
+        order = np.lexsort((dense_group, dense_frame))
+        dense_group = dense_group[order]
+        dense_frame = dense_frame[order]
+
+        # Bucket at or before each frame, and the one after it.
+        key = dense_group * self._span + (dense_frame - self.min_frame)
+        bucket = np.searchsorted(self._composite, key, side="right") - 1
+        exact = self._bucket_frame[bucket] == dense_frame
+        following = np.minimum(bucket + 1, len(self._composite) - 1)
+        has_following = (bucket + 1 < len(self._composite)) & (
+            self._bucket_group[following] == dense_group
+        )
+
+        per_frame = {
+            "Target Identification": _take(
+                self.df["Target Identification"], self._group_row[dense_group]
+            ),
+            "Category": _take(self.df["Category"], self._group_row[dense_group]),
+            "frame": pd.Series(dense_frame),
+        }
+        x = dense_frame.astype(float)
+        for col in self.columns:
+            if col in self._fill:
+                per_frame[col] = _take(self.df[col], self._fill[col][bucket])
+                continue
+            values, prev_known, next_known = self._values[col]
+            prev_idx = prev_known[bucket]
+            after = np.where(has_following, next_known[following], -1)
+            next_idx = np.where(exact, next_known[bucket], after)
+            has_prev = prev_idx >= 0
+            has_next = next_idx >= 0
+            y_prev = values[np.maximum(prev_idx, 0)]
+            y_next = values[np.maximum(next_idx, 0)]
+            out = np.where(has_prev, y_prev, y_next)
+            if col in PER_FRAME_INTERP:
+                x_prev = self._bucket_frame[np.maximum(prev_idx, 0)].astype(float)
+                x_next = self._bucket_frame[np.maximum(next_idx, 0)].astype(float)
+                span = x_next - x_prev
+                both = has_prev & has_next & (span != 0)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    weight = np.where(both, (x - x_prev) / np.where(both, span, 1), 0.0)
+                out = out + np.where(both, (y_next - y_prev) * weight, 0.0)
+            out[~has_prev & ~has_next] = np.nan
+            per_frame[col] = pd.Series(out)
+        return pd.DataFrame(per_frame), dense_group
+
+
+class FrameProvider:
+    """Per-frame rows computed on demand from the sparse observations.
+
+    Every aircraft (target identification and category) gets one row per
+    frame from its first to its last observed frame:
+
+    * the messages of one frame are reduced as ``PER_FRAME_AGG`` says:
+      positions and altitude are averaged, other columns take the first
+      value present;
+    * altitude is first interpolated over time between the aircraft's own
+      messages, so messages without one still count in the average;
+    * ``PER_FRAME_INTERP`` columns are linearly interpolated between frames
+      and hold the nearest value outside the known ones; the other columns
+      are forward- then back-filled within the aircraft.
+
+    The messages are reduced once to one bucket per aircraft and frame, and
+    a frame is built from the buckets around it with ``searchsorted``, so
+    only the frames asked for are ever materialised. Memory stays
+    proportional to the decoded messages however long the recording, and
+    recently used chunks of ``FRAME_CHUNK`` frames are cached.
+
+    Messages decoded later are added with :meth:`extend`. The buckets live
+    in parts, each holding all the messages of its aircraft: a batch goes
+    into a new part together with the earlier messages of the aircraft it
+    updates, and parts are merged log-structured style once a newer one
+    grows to half the size of the one before, so every message is reduced
+    again only a logarithmic number of times.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self._cache = OrderedDict()
+        # Chunks are also built by the dashboard's prefetch thread.
+        self._lock = threading.Lock()
+        # Incremented by every extend; views prepared before are stale.
+        self.version = 0
+        self._parts = []
+        # Aircraft keys in order of appearance and, per aircraft, its part,
+        # group in the part and summary.
+        self.keys = []
+        self._id_of = {}
+        self._part = np.zeros(0, dtype=np.int64)
+        self._group = np.zeros(0, dtype=np.int64)
+        self._first = np.zeros(0, dtype=np.int64)
+        self._last = np.zeros(0, dtype=np.int64)
+        self._drawable = np.zeros(0, dtype=bool)
+        self._altitude_low = np.zeros(0)
+        self._altitude_high = np.zeros(0)
+        self.min_frame, self.max_frame = 0, -1
+        self._empty = _FramePart(df.iloc[:0])
+        self.columns = self._empty.columns
+        self.extend(df)
+
+    def extend(self, batch: pd.DataFrame):
+        """Add the messages of ``batch``.
+
+        Only the aircraft in ``batch`` are reduced again, with their earlier
+        messages, and only the cached chunks where they fly are dropped.
+        """
+        valid = batch[FRAME_KEYS].notna().all(axis=1)
+        if not valid.any():
+            return
+        batch_keys = batch.loc[valid, FRAME_KEYS].drop_duplicates()
+        batch_keys = zip(*(batch_keys[col].to_numpy().tolist() for col in FRAME_KEYS))
+        with self._lock:
+            # Earlier messages of these aircraft leave their parts.
+            moved = self.ids(batch_keys)
+            moved = moved[moved >= 0]
+            messages = []
+            for index in np.unique(self._part[moved]):
+                groups = self._group[moved[self._part[moved] == index]]
+                messages.append(self._parts[index].messages(groups))
+            if messages:
+                batch = concat_messages(messages + [batch])
+            part = _FramePart(batch)
+            self._add_part(part)
+            affected = part.ids
+            while (
+                len(self._parts) > 1
+                and self._parts[-2].size <= 2 * self._parts[-1].size
+            ):
+                self._merge_last()
+            self._parts = [part for part in self._parts if part.size]
+            for index, part in enumerate(self._parts):
+                self._part[part.ids[part.live]] = index
+
+            self.min_frame = int(self._first.min())
+            self.max_frame = int(self._last.max())
+            self._invalidate(self._first[affected], self._last[affected])
+            self.version += 1
+
+    def _add_part(self, part):
+        # New aircraft are numbered in the part's (sorted) key order.
+        for key in part.keys:
+            if key not in self._id_of:
+                self._id_of[key] = len(self.keys)
+                self.keys.append(key)
+        extra = len(self.keys) - len(self._part)
+        if extra:
+            self._part = np.r_[self._part, np.zeros(extra, dtype=np.int64)]
+            self._group = np.r_[self._group, np.zeros(extra, dtype=np.int64)]
+            self._first = np.r_[self._first, np.zeros(extra, dtype=np.int64)]
+            self._last = np.r_[self._last, np.zeros(extra, dtype=np.int64)]
+            self._drawable = np.r_[self._drawable, np.zeros(extra, dtype=bool)]
+            self._altitude_low = np.r_[self._altitude_low, np.full(extra, np.nan)]
+            self._altitude_high = np.r_[self._altitude_high, np.full(extra, np.nan)]
+        ids = self.ids(part.keys)
+        part.ids = ids
+        self._group[ids] = np.arange(len(ids))
+        self._first[ids] = part.group_first
+        self._last[ids] = part.group_last
+        self._drawable[ids] = part.drawable
+        self._altitude_low[ids] = part.altitude_low
+        self._altitude_high[ids] = part.altitude_high
+        self._parts.append(part)
+
+    def _merge_last(self):
+        # Merging moves aircraft without changing their frames, so the
+        # cache stays valid.
+        newer = self._parts.pop()
+        older = self._parts.pop()
+        messages = [
+            part.messages(np.flatnonzero(part.live))
+            for part in (older, newer)
+            if part.size
+        ]
+        self._add_part(_FramePart(concat_messages(messages)))
+
+    def _invalidate(self, first, last):
+        """Drop the cached chunks overlapping any range ``first..last``."""
+        for chunk in list(self._cache):
+            lo = chunk * FRAME_CHUNK
+            if ((first <= lo + FRAME_CHUNK - 1) & (last >= lo)).any():
+                del self._cache[chunk]
+
+    def __len__(self):
+        """Number of per-frame rows the recording expands to."""
+        return int((self._last - self._first + 1).sum())
+
+    def categories(self):
+        """Categories of the drawable aircraft, in order of appearance."""
+        drawable = np.flatnonzero(self._drawable)
+        order = drawable[np.argsort(self._first[drawable], kind="stable")]
+        return pd.unique(np.array([self.keys[i][1] for i in order])).tolist()
+
+    def altitude_range(self):
+        """Lowest and highest per-frame altitude of the drawable aircraft."""
+        low = self._altitude_low[self._drawable]
+        high = self._altitude_high[self._drawable]
+        if np.isnan(low).all():
+            return np.nan, np.nan
+        return np.nanmin(low), np.nanmax(high)
+
+    def ids(self, keys) -> np.ndarray:
+        """Index of each aircraft key in :attr:`keys` (-1 if unknown)."""
+        return np.array([self._id_of.get(key, -1) for key in keys], dtype=np.int64)
+
+    def positions(self, time):
+        """Interpolated ``(x, y)`` of every aircraft in :attr:`keys` at
+        ``time``; NaN for aircraft without any position."""
+        x = np.full(len(self.keys), np.nan)
+        y = np.full(len(self.keys), np.nan)
+        for part in self._parts:
+            if not len(part.timeline):
+                continue
+            part_x, part_y = part.timeline.positions(time)
+            live = part.live[part.timeline_group]
+            ids = part.ids[part.timeline_group[live]]
+            x[ids] = part_x[live]
+            y[ids] = part_y[live]
+        return x, y
+
+    def window(self, first, last) -> pd.DataFrame:
+        """Per-frame rows of frames ``first..last``, sorted by frame."""
+        first = max(first, self.min_frame)
+        last = min(last, self.max_frame)
+        if first > last:
+            return self._materialize(0, -1)
+        with self._lock:
+            parts = [
+                self._chunk(chunk)
+                for chunk in range(first // FRAME_CHUNK, last // FRAME_CHUNK + 1)
+            ]
+        df = parts[0] if len(parts) == 1 else concat_messages(parts)
+        frames = df["frame"].to_numpy()
+        lo = np.searchsorted(frames, first)
+        hi = np.searchsorted(frames, last, side="right")
+        return df.iloc[lo:hi].reset_index(drop=True)
+
+    def _chunk(self, chunk):
+        df = self._cache.get(chunk)
+        if df is None:
+            first = chunk * FRAME_CHUNK
+            df = self._materialize(first, first + FRAME_CHUNK - 1)
+            self._cache[chunk] = df
+            if len(self._cache) > FRAME_CACHE_CHUNKS:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(chunk)
+        return df
+
+    def _materialize(self, first, last):
+        frames, ids = [], []
+        for part in self._parts:
+            df, groups = part.materialize(first, last)
+            if len(df):
+                frames.append(df)
+                ids.append(part.ids[groups])
+        if not frames:
+            per_frame_df, _ = self._empty.materialize(0, -1)
+        else:
+            ids = np.concatenate(ids)
+            per_frame_df = frames[0] if len(frames) == 1 else concat_messages(frames)
+            # Rows of a frame in aircraft order, whichever part they are in.
+            order = np.lexsort((ids, per_frame_df["frame"].to_numpy()))
+            if (order != np.arange(len(order))).any():
+                per_frame_df = per_frame_df.iloc[order].reset_index(drop=True)
+        per_frame_df["Time (s since midnight)"] = per_frame_df["frame"].astype(float)
+        per_frame_df["Ground Status"] = ground_status(per_frame_df)
+        return per_frame_df
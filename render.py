@@ -0,0 +1,155 @@
+"""Map-view rendering: level-of-detail geometry and series pooling.
+
+Drawing every aircraft with its own DearPyGui series makes frame time grow
+with traffic. In LOD mode the dashboard gives its own series only to the
+``DETAIL_LIMIT`` most relevant tracks (the clicked one, then those closest to
+the centre of the view). It merges the rest into one marker series and one
+trail series per category. Trails are decimated to the on-screen resolution,
+so zooming out also shortens them. The geometry helpers are plain NumPy over
+:class:`frames.TrackIndex` arrays.
+
+:class:`SeriesPool` recycles the per-aircraft DearPyGui series in both
+modes. The number of items therefore follows the peak number of aircraft on
+screen, not the number of callsigns seen over the whole recording.
+"""
+
+import dearpygui.dearpygui as dpg
+import numpy as np
+
+# Tracks drawn with their own (coloured, labelled) series in LOD mode.
+DETAIL_LIMIT = 32
+# Trail points closer than this on screen are merged.
+TRAIL_TOLERANCE_PX = 2.0
+# Categories with their own batched series; others share one.
+LOD_CATEGORIES = (21, 48)
+
+
+def view_tolerance(x_limits, width_px, tolerance_px=TRAIL_TOLERANCE_PX):
+    """Data units spanned by ``tolerance_px`` pixels along the x axis."""
+    return (x_limits[1] - x_limits[0]) * tolerance_px / max(width_px, 1)
+
+
+def range_indices(lo, hi):
+    """Concatenate ``arange(lo[i], hi[i])`` for all i.
+
+    Returns the indices and, for each one, the position ``i`` of its range.
+    """
+    lengths = hi - lo
+    offsets = np.cumsum(lengths) - lengths
+    group = np.repeat(np.arange(len(lo)), lengths)
+    indices = np.arange(lengths.sum()) + np.repeat(lo - offsets, lengths)
+    return indices, group
+
+
+def decimate(x, y, group, tolerance):
+    """Mask of the points kept on a ``tolerance`` grid.
+
+    A point is dropped when it falls in the same grid cell as the previous
+    point of its group. The first and last point of every group are always
+    kept.
+    """
+    keep = np.ones(len(x), dtype=bool)
+    if tolerance <= 0 or len(x) < 2:
+        return keep
+    cell_x = np.floor(x / tolerance)
+    cell_y = np.floor(y / tolerance)
+    boundary = group[1:] != group[:-1]
+    keep[1:] = (cell_x[1:] != cell_x[:-1]) | (cell_y[1:] != cell_y[:-1]) | boundary
+    keep[:-1] |= boundary
+    return keep
+
+
+def trail_polyline(tracks, lo, hi, selected, tolerance):
+    """Decimated trails of the ``selected`` tracks as one x/y polyline.
+
+    Tracks are separated by NaN, which line series draw as a gap. Tracks
+    with fewer than two samples in their window are left out.
+    """
+    lo, hi = lo[selected], hi[selected]
+    drawn = hi - lo >= 2
+    lo, hi = lo[drawn], hi[drawn]
+    indices, group = range_indices(lo, hi)
+    x, y = tracks.x[indices], tracks.y[indices]
+    keep = decimate(x, y, group, tolerance)
+    x, y, group = x[keep], y[keep], group[keep]
+
+    size = len(x) + len(lo) - 1 if len(lo) else 0
+    out_x = np.full(size, np.nan)
+    out_y = np.full(size, np.nan)
+    positions = np.arange(len(x)) + group
+    out_x[positions] = x
+    out_y[positions] = y
+    return out_x, out_y
+
+
+def select_detail(x, y, visible, x_limits, y_limits, limit=DETAIL_LIMIT, pinned=()):
+    """Tracks drawn with their own series, most relevant first.
+
+    ``pinned`` tracks come first, followed by the ``visible`` tracks inside
+    the view in order of distance to its centre. At most ``limit`` tracks
+    are returned.
+    """
+    in_view = (
+        visible
+        & (x >= x_limits[0])
+        & (x <= x_limits[1])
+        & (y >= y_limits[0])
+        & (y <= y_limits[1])
+    )
+    pinned = [t for t in pinned if visible[t]]
+    in_view[pinned] = False
+    candidates = np.flatnonzero(in_view)
+    room = max(limit - len(pinned), 0)
+    if len(candidates) > room:
+        centre_x = (x_limits[0] + x_limits[1]) / 2
+        centre_y = (y_limits[0] + y_limits[1]) / 2
+        distance = (x[candidates] - centre_x) ** 2 + (y[candidates] - centre_y) ** 2
+        candidates = candidates[np.argsort(distance, kind="stable")[:room]]
+    return np.concatenate([np.asarray(pinned, dtype=np.int64), candidates])
+
+
+class SeriesPool:
+    """Marker/trail series pairs handed out per aircraft and recycled.
+
+    ``create()`` makes a new ``(marker, trail)`` pair when none is free.
+    ``assign(pair, key)`` relabels and re-themes a pair for ``key``. Released
+    pairs are blanked and kept for the next aircraft that enters the scene.
+    """
+
+    def __init__(self, create, assign):
+        self._create = create
+        self._assign = assign
+        self.active = {}
+        self._free = []
+        self.created = 0
+
+    def __len__(self):
+        return len(self.active)
+
+    def __contains__(self, key):
+        return key in self.active
+
+    def acquire(self, key):
+        """Return the pair drawing ``key``, taking a free one if needed."""
+        pair = self.active.get(key)
+        if pair is None:
+            if self._free:
+                pair = self._free.pop()
+            else:
+                pair = self._create()
+                self.created += 1
+            self._assign(pair, key)
+            self.active[key] = pair
+        return pair
+
+    def release(self, key):
+        """Blank the pair drawing ``key`` and make it available again."""
+        pair = self.active.pop(key, None)
+        if pair is not None:
+            for series in pair:
+                dpg.set_value(series, ([], []))
+            self._free.append(pair)
+
+    def release_all(self):
+        for key in list(self.active):
+            self.release(key)